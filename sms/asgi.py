@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sms.settings')
 
+# Async views run each query in a fresh thread, so persistent connections
+# would pile up instead of being reused. Serve with e.g.
+# `uvicorn sms.asgi:application --workers 4` and use /async/ URLs for reads.
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
+
 application = get_asgi_application()
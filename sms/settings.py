@@ -42,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'supply.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,15 +73,128 @@ TEMPLATES = [
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DATABASE_ENGINE picks sqlite (default) or postgres. Connections are kept
+# open for DATABASE_CONN_MAX_AGE seconds and health-checked before reuse.
+# SQLite uses IMMEDIATE write transactions so concurrent request
+# submissions queue on busy_timeout instead of failing with "database is
+# locked"; see `manage.py bench_db_writes`. WAL mode is stored in the
+# database file itself (and adds -wal/-shm files beside it), so it is
+# opt-in: set DATABASE_SQLITE_WAL=1 on deployments that want it.
+
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite')
+
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', 60))
+
+DATABASE_SQLITE_WAL = os.environ.get('DATABASE_SQLITE_WAL', 'false').lower() in ('1', 'true', 'yes')
+
+# Per-connection pragmas, applied on every connect
+SQLITE_PRAGMAS = {
+    # NORMAL is only crash-safe in WAL mode
+    'synchronous': 'NORMAL' if DATABASE_SQLITE_WAL else 'FULL',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024)),
+}
+
+DATABASE_ENGINES = {
+    'sqlite': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+            'init_command': (
+                ('PRAGMA journal_mode=WAL;' if DATABASE_SQLITE_WAL else '')
+                + ''.join(f'PRAGMA {name}={value};' for name, value in SQLITE_PRAGMAS.items())
+            ),
+        },
+    },
+    'postgres': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DATABASE_NAME', 'sms'),
+        'USER': os.environ.get('DATABASE_USER', ''),
+        'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+        'HOST': os.environ.get('DATABASE_HOST', ''),
+        'PORT': os.environ.get('DATABASE_PORT', ''),
+    },
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        **DATABASE_ENGINES[DATABASE_ENGINE],
+        'CONN_MAX_AGE': DATABASE_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 AUTH_USER_MODEL = 'supply.CustomUser'
 
+# Permission sets are cached per user and invalidated by supply.signals
+AUTHENTICATION_BACKENDS = [
+    'supply.permissions.CachedPermissionBackend',
+]
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# CACHE_BACKEND picks locmem (default), file or redis; the redis backend needs
+# the `redis` package and works with any Redis-compatible server.
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sms',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(BASE_DIR, '.cache')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+# locmem is private to each process; anything every worker must see the same
+# way (invalidations, sessions) is only cached when the backend is shared
+CACHE_IS_SHARED = CACHE_BACKEND != 'locmem'
+
+# Seconds a versioned catalog entry may live; a version bump invalidates it sooner
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 3600))
+
+# Seconds a user's permission set is cached across requests; 0 turns the
+# cross-request cache off (the default on locmem, where another worker's
+# revocation would never reach this process's copy)
+PERMISSION_CACHE_TIMEOUT = int(os.environ.get('PERMISSION_CACHE_TIMEOUT', 3600 if CACHE_IS_SHARED else 0))
+
+# Request instrumentation (supply.instrumentation.RequestMetricsMiddleware).
+# Requests over a budget, or repeating one statement N times (an N+1 loop),
+# are logged to the `supply.metrics` logger.
+REQUEST_METRICS_HEADERS = os.environ.get('REQUEST_METRICS_HEADERS', str(DEBUG)).lower() in ('1', 'true', 'yes')
+
+REQUEST_QUERY_BUDGET = int(os.environ.get('REQUEST_QUERY_BUDGET', 30))
+
+REQUEST_LATENCY_BUDGET_MS = int(os.environ.get('REQUEST_LATENCY_BUDGET_MS', 500))
+
+REQUEST_N_PLUS_ONE_THRESHOLD = int(os.environ.get('REQUEST_N_PLUS_ONE_THRESHOLD', 5))
+
+# Demand forecasting (supply.forecasting, `manage.py forecast_reorder_levels`;
+# needs the optional `numpy` package). Reorder points cover lead-time demand
+# plus safety stock for FORECAST_SERVICE_LEVEL; FORECAST_ORDER_COST is the
+# fixed cost of one order and FORECAST_HOLDING_RATE the yearly holding cost
+# as a fraction of unit cost, used for the economic order quantity.
+FORECAST_WINDOW_DAYS = int(os.environ.get('FORECAST_WINDOW_DAYS', 90))
+
+FORECAST_SERVICE_LEVEL = float(os.environ.get('FORECAST_SERVICE_LEVEL', 0.95))
+
+FORECAST_ORDER_COST = float(os.environ.get('FORECAST_ORDER_COST', 50))
+
+FORECAST_HOLDING_RATE = float(os.environ.get('FORECAST_HOLDING_RATE', 0.25))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -123,8 +237,52 @@ STATIC_URL = 'assets/static/'
 STATICFILES_DIRS = [
         os.path.join(BASE_DIR, "assets/static"),
     ]
+
+STATIC_ROOT = os.environ.get('STATIC_ROOT', os.path.join(BASE_DIR, 'staticfiles'))
+
+# Production static pipeline: collectstatic writes content-hashed names plus
+# .gz/.br copies (brotli needs the optional `brotli` package), and
+# `manage.py static_report` shows the bytes saved. SERVE_STATIC lets Django
+# serve them with immutable cache headers when there is no front-end server.
+STATIC_MANIFEST = os.environ.get('STATIC_MANIFEST', str(not DEBUG)).lower() in ('1', 'true', 'yes')
+
+SERVE_STATIC = os.environ.get('SERVE_STATIC', 'false').lower() in ('1', 'true', 'yes')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'supply.staticfiles.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 MEDIA_URL = 'media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'  # Default session engine
\ No newline at end of file
+# Worker processes that resize uploaded supply images (see supply/images.py)
+IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', 2))
+
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+# SESSION_BACKEND picks db, cached_db, cache, file or signed_cookies.
+# cached_db serves reads from the cache and only writes through to the
+# database on change; it is the default only on a shared cache, since on
+# locmem a logout in one worker would leave the session live in the others.
+# See `manage.py bench_sessions` to compare them.
+
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'cached_db' if CACHE_IS_SHARED else 'db')
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'file': 'django.contrib.sessions.backends.file',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[SESSION_BACKEND]
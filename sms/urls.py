@@ -16,8 +16,9 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.conf import settings
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf.urls.static import static
+from supply.staticfiles import serve_static
 
 
 
@@ -27,4 +28,7 @@ urlpatterns = [
 ]
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+if settings.SERVE_STATIC:
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve_static)]
\ No newline at end of file
@@ -43,11 +43,33 @@ class CustomUserAdmin(UserAdmin):
     reset_password_link.short_description = 'Reset Password'
 
 
+class StockMovementAdmin(admin.ModelAdmin):
+    """The stock ledger is append-only, so the admin can browse it but never edit it."""
+    list_display = ['supply_item', 'delta', 'reason', 'supply_request', 'created_at']
+    list_filter = ['reason']
+    list_select_related = ['supply_item', 'supply_request']
+    readonly_fields = ['supply_item', 'delta', 'reason', 'supply_request', 'created_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 admin.site.register(CustomUser,CustomUserAdmin)
 admin.site.register(SupplyManagerProfile)
 admin.site.register(SupplierProfile)
 admin.site.register(SupplyItem)
-admin.site.register(SupplyItemTransaction)
+admin.site.register(SupplyItemTransaction, list_select_related=('supply_item',))
 admin.site.register(CustomerProfile)
-admin.site.register(SupplyItemRequest)
-
+admin.site.register(SupplyItemRequest, list_select_related=('supply_item', 'customer__user'))
+admin.site.register(ReorderQueueEntry)
+admin.site.register(StockMovement, StockMovementAdmin)
+admin.site.register(StockSnapshot)
+admin.site.register(ReorderSuggestion)
+admin.site.register(DailyItemRollup)
+admin.site.register(DailyCategoryRollup)
@@ -0,0 +1,52 @@
+import math
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def scratch_database(verbosity=0, on_disk=False):
+    """
+    Run a benchmark against a throwaway test database with the current
+    schema, so it can create users and data without touching the real one.
+
+    SQLite test databases live in shared memory, which has no busy timeout
+    and fails concurrent writers at once; pass ``on_disk`` for benchmarks
+    that run several connections at the same time.
+    """
+    settings_dict = connection.settings_dict
+    old_name, old_test = settings_dict['NAME'], settings_dict['TEST']
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if on_disk and connection.vendor == 'sqlite':
+            settings_dict['TEST'] = {**old_test, 'NAME': str(Path(tmpdir) / 'scratch.sqlite3')}
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity)
+            teardown_test_environment()
+            settings_dict['TEST'] = old_test
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies, **extra):
+    """p50/p95/mean of a list of latencies in seconds, reported in milliseconds."""
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        **extra,
+    }
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from supply.facets import acompute_facets, apply_facets, compute_facets
+from supply.models import SupplyItem
+from supply.pagination import KeysetPaginator
+from supply.search import search_supply_items, search_terms
+
+CATALOG_VERSION_KEY = 'supply:catalog:version'
+CATALOG_HITS_KEY = 'supply:catalog:hits'
+CATALOG_MISSES_KEY = 'supply:catalog:misses'
+
+# Items per customer catalog page; every page is cached on its own
+CATALOG_PAGE_SIZE = 25
+
+# Every requestable item is active, so customers do not filter by status
+CUSTOMER_FACETS = ('category', 'supplier', 'stock')
+
+
+def catalog_version():
+    """
+    The current catalog version. A missing (evicted) version is replaced by
+    a fresh timestamp so stale entries can never be matched again.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+async def acatalog_version():
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+async def _acount(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        await cache.aincr(key)
+
+
+def _requestable_base(query=''):
+    items = SupplyItem.objects.filter(status='ACTIVE')
+    if search_terms(query):
+        items = search_supply_items(items, query).order_by('search_rank', 'id')
+    return items
+
+
+def _requestable_items(query='', filters=None):
+    return apply_facets(_requestable_base(query), filters or {}).prefetch_related('suppliers')
+
+
+def requestable_paginator(query='', filters=None):
+    """Keyset pages of the requestable items: by name, or best search matches first."""
+    ordering = ['search_rank', 'id'] if search_terms(query) else ['name', 'id']
+    return KeysetPaginator(_requestable_items(query, filters), ordering, CATALOG_PAGE_SIZE)
+
+
+def _page_cursor(after=None, before=None):
+    """The cursor a page is addressed by, matching how KeysetPaginator.page() reads them."""
+    if before is not None and after is None:
+        return ['before', before]
+    return ['after', after] if after else None
+
+
+def _catalog_key(version, query, filters=None, part='items', cursor=None):
+    """Cache key for one catalog version, search, facet selection and page; hashed to stay key-safe."""
+    terms = ' '.join(search_terms(query)).lower()
+    if not terms and not filters and part == 'items' and not cursor:
+        return f'supply:catalog:{version}'
+    key = [terms, filters or {}] + ([cursor] if cursor else [])
+    digest = hashlib.md5(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return f'supply:catalog:{version}:{part}:{digest}'
+
+
+def _catalog_entry(item):
+    return {
+        'id': item.id,
+        'name': item.name,
+        'category': item.category,
+        'unit_of_measure': item.unit_of_measure,
+        'image': item.supply_image.name or '',
+        'image_variants': item.image_variants,
+        'suppliers': [supplier.company_name for supplier in item.suppliers.all()],
+    }
+
+
+def _catalog_page(page):
+    """A KeysetPage as plain data, so it can be cached without its queryset."""
+    return {
+        'object_list': [_catalog_entry(item) for item in page],
+        'has_next': page.has_next(),
+        'has_previous': page.has_previous(),
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    }
+
+
+def build_requestable_catalog(query='', filters=None, after=None, before=None):
+    """
+    One page of the active items customers can request, with their supplier
+    names. Raises InvalidCursor for a cursor that does not decode.
+    """
+    return _catalog_page(requestable_paginator(query, filters).page(after, before))
+
+
+async def abuild_requestable_catalog(query='', filters=None, after=None, before=None):
+    return _catalog_page(await requestable_paginator(query, filters).apage(after, before))
+
+
+def _cached(key, build):
+    value = cache.get(key)
+    if value is None:
+        _count(CATALOG_MISSES_KEY)
+        value = build()
+        cache.set(key, value, settings.CATALOG_CACHE_TIMEOUT)
+    else:
+        _count(CATALOG_HITS_KEY)
+    return value
+
+
+async def _acached(key, abuild):
+    value = await cache.aget(key)
+    if value is None:
+        await _acount(CATALOG_MISSES_KEY)
+        value = await abuild()
+        await cache.aset(key, value, settings.CATALOG_CACHE_TIMEOUT)
+    else:
+        await _acount(CATALOG_HITS_KEY)
+    return value
+
+
+def get_requestable_catalog(query='', filters=None, after=None, before=None):
+    """A customer catalog page, served from cache for the current version, search, facets and cursor."""
+    return _cached(
+        _catalog_key(catalog_version(), query, filters, cursor=_page_cursor(after, before)),
+        lambda: build_requestable_catalog(query, filters, after, before),
+    )
+
+
+async def aget_requestable_catalog(query='', filters=None, after=None, before=None):
+    """Async variant of get_requestable_catalog() for the ASGI views."""
+    return await _acached(
+        _catalog_key(await acatalog_version(), query, filters, cursor=_page_cursor(after, before)),
+        lambda: abuild_requestable_catalog(query, filters, after, before),
+    )
+
+
+def get_requestable_facets(query='', filters=None):
+    """Facet counts for the customer catalog, cached alongside the items they describe."""
+    return _cached(
+        _catalog_key(catalog_version(), query, filters, part='facets'),
+        lambda: compute_facets(_requestable_base(query), filters or {}, CUSTOMER_FACETS),
+    )
+
+
+async def aget_requestable_facets(query='', filters=None):
+    return await _acached(
+        _catalog_key(await acatalog_version(), query, filters, part='facets'),
+        lambda: acompute_facets(_requestable_base(query), filters or {}, CUSTOMER_FACETS),
+    )
+
+
+def get_supply_item_facets(query='', filters=None):
+    """
+    Facet counts for the manager's item list (every status), cached per
+    catalog version so paging through the list does not regroup the catalog.
+    """
+    def build():
+        items = SupplyItem.objects.all()
+        if search_terms(query):
+            items = search_supply_items(items, query)
+        return compute_facets(items, filters or {})
+
+    return _cached(_catalog_key(catalog_version(), query, filters, part='manager-facets'), build)
+
+
+def catalog_cache_stats():
+    hits = cache.get(CATALOG_HITS_KEY, 0)
+    misses = cache.get(CATALOG_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'version': cache.get(CATALOG_VERSION_KEY),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_catalog_cache_stats():
+    cache.delete_many([CATALOG_HITS_KEY, CATALOG_MISSES_KEY])
+
+
+def warm_catalog_cache():
+    """
+    Build and store the first unfiltered catalog page and its facets for the
+    current version. Returns the number of items on that page.
+    """
+    version = catalog_version()
+    catalog = build_requestable_catalog()
+    cache.set(_catalog_key(version, ''), catalog, settings.CATALOG_CACHE_TIMEOUT)
+    facets = compute_facets(_requestable_base(), {}, CUSTOMER_FACETS)
+    cache.set(_catalog_key(version, '', part='facets'), facets, settings.CATALOG_CACHE_TIMEOUT)
+    return len(catalog['object_list'])
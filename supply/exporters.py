@@ -0,0 +1,62 @@
+import csv
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from supply.models import SupplyItemTransaction
+
+TRANSACTION_EXPORT_COLUMNS = [
+    ('id', 'Transaction ID'),
+    ('transaction_date', 'Transaction Date'),
+    ('transaction_type', 'Type'),
+    ('status', 'Status'),
+    ('quantity', 'Quantity'),
+    ('supply_item__item_id', 'Item ID'),
+    ('supply_item__name', 'Item Name'),
+    ('supply_item__category', 'Category'),
+    ('customer__user__username', 'Customer Username'),
+    ('customer__user__first_name', 'Customer First Name'),
+    ('customer__user__last_name', 'Customer Last Name'),
+]
+
+
+class Echo:
+    """A file-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def filter_transactions(queryset, date_from=None, date_to=None, transaction_type=None, status=None):
+    """Apply the export filters as plain range/equality lookups the indexes can use."""
+    if date_from:
+        queryset = queryset.filter(transaction_date__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        queryset = queryset.filter(
+            transaction_date__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+        )
+    if transaction_type:
+        queryset = queryset.filter(transaction_type=transaction_type)
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def transaction_csv_lines(chunk_size=2000, **filters):
+    """
+    Yield the transaction history as CSV lines, header first.
+
+    Only the exported columns are selected, item and customer names are
+    joined in SQL, and rows are read with .iterator() so memory stays flat.
+    """
+    fields = [field for field, _ in TRANSACTION_EXPORT_COLUMNS]
+    rows = (
+        filter_transactions(SupplyItemTransaction.objects.all(), **filters)
+        .order_by('transaction_date', 'id')
+        .values_list(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for _, header in TRANSACTION_EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,168 @@
+"""
+Catalog facets: category, status, supplier and stock band.
+
+Counts for every facet come from a single statement: a UNION ALL of one
+GROUP BY over (category, status, stock band) and one over the same columns
+plus supplier. Each facet's counts apply the selections of the *other*
+facets, so picking a category still shows how many items every other
+category would have.
+"""
+from django.db.models import Case, CharField, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
+
+from supply.models import SupplierProfile, SupplyItem
+
+FACETS = ('category', 'status', 'supplier', 'stock')
+
+STOCK_BANDS = {
+    'out': 'Out of stock',
+    'low': 'Low stock',
+    'ok': 'In stock',
+}
+
+STOCK_BAND_FILTERS = {
+    'out': Q(quantity=0),
+    'low': Q(quantity__gt=0, quantity__lte=F('reorder_level')),
+    'ok': Q(quantity__gt=F('reorder_level')),
+}
+
+FACET_LABELS = {
+    'category': 'Category',
+    'status': 'Status',
+    'supplier': 'Supplier',
+    'stock': 'Stock',
+}
+
+# The columns each facet reads from a facet row
+_ROW_KEYS = {
+    'category': 'category',
+    'status': 'facet_status',
+    'supplier': 'facet_supplier',
+    'stock': 'facet_stock',
+}
+
+
+def selected_facets(params, facets=FACETS):
+    """The facet values picked in a request's query string, e.g. ?category=a&category=b."""
+    selected = {}
+    for facet in facets:
+        values = [value for value in params.getlist(facet) if value]
+        if facet == 'supplier':
+            values = [value for value in values if value.isdigit()]
+        if values:
+            selected[facet] = sorted(set(values))
+    return selected
+
+
+def item_stock_band(quantity, reorder_level):
+    """The band of STOCK_BAND_FILTERS an item with these values falls in."""
+    if quantity == 0:
+        return 'out'
+    return 'low' if quantity <= reorder_level else 'ok'
+
+
+def stock_band():
+    return Case(
+        *(When(condition, then=Value(band)) for band, condition in STOCK_BAND_FILTERS.items()),
+        output_field=CharField(),
+    )
+
+
+def _supplied_by(supplier_ids):
+    through = SupplierProfile.supply_items.through
+    return Q(id__in=through.objects.filter(supplierprofile_id__in=supplier_ids).values('supplyitem_id'))
+
+
+def apply_facets(queryset, selected):
+    """Restrict ``queryset`` to the selected values: OR within a facet, AND across facets."""
+    if 'category' in selected:
+        queryset = queryset.filter(category__in=selected['category'])
+    if 'status' in selected:
+        queryset = queryset.annotate(facet_status=Upper('status')).filter(facet_status__in=selected['status'])
+    if 'supplier' in selected:
+        queryset = queryset.filter(_supplied_by(selected['supplier']))
+    if 'stock' in selected:
+        condition = Q()
+        for band in selected['stock']:
+            condition |= STOCK_BAND_FILTERS.get(band, Q(pk__in=[]))
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+def facet_rows(queryset, selected):
+    """
+    One UNION ALL query of grouped counts. Supplier selection is applied in
+    SQL to the item rows only; every other selection is applied in Python.
+    """
+    queryset = queryset.order_by()
+    items = queryset
+    if 'supplier' in selected:
+        items = items.filter(_supplied_by(selected['supplier']))
+    items = items.values(
+        'category',
+        facet_status=Upper('status'),
+        facet_stock=stock_band(),
+        facet_supplier=Value(None, output_field=IntegerField()),
+        facet_supplier_name=Value(None, output_field=CharField()),
+    ).annotate(count=Count('id'))
+    suppliers = queryset.filter(suppliers__isnull=False).values(
+        'category',
+        facet_status=Upper('status'),
+        facet_stock=stock_band(),
+        facet_supplier=F('suppliers__id'),
+        facet_supplier_name=F('suppliers__company_name'),
+    ).annotate(count=Count('id'))
+    return items.union(suppliers, all=True)
+
+
+def count_facets(rows, selected, facets=FACETS):
+    """
+    Turn facet rows into ``{facet: [{'value', 'label', 'count', 'selected'}]}``,
+    counting each facet under the selections of the others.
+    """
+    counts = {facet: {} for facet in facets}
+    labels = {'status': dict(SupplyItem.STATUS_CHOICES), 'stock': STOCK_BANDS}
+    supplier_labels = labels.setdefault('supplier', {})
+
+    for row in rows:
+        is_supplier_row = row['facet_supplier'] is not None
+        if is_supplier_row:
+            supplier_labels[str(row['facet_supplier'])] = row['facet_supplier_name']
+        for facet in facets:
+            if (facet == 'supplier') != is_supplier_row:
+                continue
+            if any(
+                str(row[_ROW_KEYS[other]]) not in selected[other]
+                for other in facets
+                if other not in (facet, 'supplier') and other in selected
+            ):
+                continue
+            value = str(row[_ROW_KEYS[facet]])
+            counts[facet][value] = counts[facet].get(value, 0) + row['count']
+
+    result = {}
+    for facet in facets:
+        for value in selected.get(facet, []):
+            counts[facet].setdefault(value, 0)
+        result[facet] = sorted(
+            (
+                {
+                    'value': value,
+                    'label': labels.get(facet, {}).get(value, value),
+                    'count': count,
+                    'selected': value in selected.get(facet, []),
+                }
+                for value, count in counts[facet].items()
+            ),
+            key=lambda entry: entry['label'].lower(),
+        )
+    return result
+
+
+def compute_facets(queryset, selected, facets=FACETS):
+    return count_facets(facet_rows(queryset, selected), selected, facets)
+
+
+async def acompute_facets(queryset, selected, facets=FACETS):
+    rows = [row async for row in facet_rows(queryset, selected)]
+    return count_facets(rows, selected, facets)
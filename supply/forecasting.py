@@ -0,0 +1,202 @@
+"""
+Demand forecasts and suggested reorder points for the whole catalog.
+
+Request transactions in the window stream out of the database in date
+order, a chunk at a time, and NumPy folds each day into per-item running
+totals with one bincount, so memory stays proportional to the catalog, not
+the history. Every item's figures are then computed at once:
+
+    daily demand    d = units / window_days
+    variability     s = sqrt(squares / window_days - d**2)
+    safety stock    z * s * sqrt(lead_time_days)
+    reorder point   d * lead_time_days + safety stock
+    order quantity  sqrt(2 * 365 * d * order_cost / (holding_rate * unit_cost))
+
+where ``squares`` sums each day's squared total and z is the normal
+quantile of the target service level. Needs the optional numpy package.
+"""
+from datetime import timedelta
+from itertools import repeat
+from statistics import NormalDist
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import F, Func, IntegerField, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from supply.catalog import bump_catalog_version
+from supply.models import ReorderSuggestion, SupplyItem, SupplyItemTransaction
+from supply.reorder import rebuild_reorder_queue
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the forecast job needs it
+    np = None
+
+# Customer request transactions; the signal writes REQUEST, the model's choices say REQUESTED
+DEMAND_TRANSACTION_TYPES = ('REQUEST', 'REQUESTED')
+VOID_STATUSES = ('CANCELLED', 'REJECTED', 'RETURNED')
+
+# Rows fetched per round trip when streaming history and item details
+READ_CHUNK_SIZE = 100000
+
+SUGGESTION_FIELDS = (
+    'supply_item', 'daily_demand', 'demand_std', 'safety_stock', 'reorder_point',
+    'economic_order_quantity', 'window_days', 'computed_at',
+)
+
+# Unit cost floor, so free items do not get an infinite order quantity
+MIN_UNIT_COST = 0.01
+
+
+class DayNumber(Func):
+    """The (UTC) day of a datetime as a number, computed natively by the database."""
+    output_field = IntegerField()
+    template = 'CAST(%(expressions)s AS DATE)'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # julianday() is built in (Django's date truncation calls back into Python
+        # per row); Julian days start at noon, hence the half-day shift
+        return self.as_sql(compiler, connection, template='CAST(julianday(%(expressions)s) + 0.5 AS INTEGER)')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='(EXTRACT(EPOCH FROM %(expressions)s)::bigint / 86400)')
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='TO_DAYS(%(expressions)s)')
+
+
+def demand_rows(since):
+    """(day number, item id, units) of every request transaction since ``since``, in date order."""
+    return (
+        SupplyItemTransaction.objects.filter(
+            transaction_type__in=DEMAND_TRANSACTION_TYPES,
+            transaction_date__gte=since,
+        )
+        .exclude(status__in=VOID_STATUSES)
+        .order_by('transaction_date')
+        .values_list(DayNumber('transaction_date'), 'supply_item', 'quantity')
+    )
+
+
+def raw_chunks(queryset, chunk_size=READ_CHUNK_SIZE):
+    """
+    The rows of ``queryset`` as plain tuples, a chunk at a time. Skips the
+    per-row conversion of QuerySet iteration, which costs more than the
+    query itself over millions of rows.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+
+
+def demand_totals(chunks, size):
+    """
+    Fold date-ordered (day, item id, units) rows into two arrays indexed by
+    item id: total units, and the sum of squared daily totals.
+    """
+    units = np.zeros(size)
+    squares = np.zeros(size)
+    day_units = np.zeros(size)
+    current_day = None
+    for chunk in chunks:
+        chunk = np.array(chunk, dtype=np.int64)
+        for day in np.split(chunk, np.flatnonzero(np.diff(chunk[:, 0])) + 1):
+            if day[0, 0] != current_day:
+                units += day_units
+                squares += day_units ** 2
+                day_units[:] = 0
+                current_day = day[0, 0]
+            day_units += np.bincount(day[:, 1], weights=day[:, 2], minlength=size)
+    units += day_units
+    squares += day_units ** 2
+    return units, squares
+
+
+def reorder_points(units, squares, lead_time_days, unit_cost, window_days, service_level, order_cost, holding_rate):
+    """Vectorized demand statistics and reorder figures; every argument may be an array."""
+    demand = units / window_days
+    std = np.sqrt(np.maximum(squares / window_days - demand ** 2, 0))
+    z = NormalDist().inv_cdf(service_level)
+    safety_stock = np.ceil(z * std * np.sqrt(lead_time_days))
+    reorder_point = np.ceil(demand * lead_time_days + safety_stock)
+    holding_cost = holding_rate * np.maximum(unit_cost, MIN_UNIT_COST)
+    order_quantity = np.ceil(np.sqrt(2 * 365 * demand * order_cost / holding_cost))
+    return {
+        'daily_demand': demand,
+        'demand_std': std,
+        'safety_stock': safety_stock.astype(np.int64),
+        'reorder_point': reorder_point.astype(np.int64),
+        'economic_order_quantity': order_quantity.astype(np.int64),
+    }
+
+
+def write_suggestions(rows):
+    """Replace every ReorderSuggestion with ``rows`` (SUGGESTION_FIELDS order) in one executemany."""
+    meta = ReorderSuggestion._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(meta.get_field(name).column) for name in SUGGESTION_FIELDS)
+    placeholders = ', '.join(['%s'] * len(SUGGESTION_FIELDS))
+    with transaction.atomic():
+        ReorderSuggestion.objects.all().delete()
+        with connection.cursor() as cursor:
+            cursor.executemany(f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})", rows)
+
+
+def forecast_reorder_levels(window_days=None, service_level=None, order_cost=None, holding_rate=None):
+    """
+    Recompute every item's ReorderSuggestion from its request history;
+    items with no demand in the window get none. Returns the number of
+    suggestions written.
+    """
+    if np is None:
+        raise ImproperlyConfigured("Demand forecasting needs the numpy package.")
+    window_days = window_days or settings.FORECAST_WINDOW_DAYS
+    now = timezone.now()
+
+    size = (SupplyItem.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+    units, squares = demand_totals(raw_chunks(demand_rows(now - timedelta(days=window_days))), size)
+    lead_time_days = np.zeros(size)
+    unit_cost = np.zeros(size)
+    for chunk in raw_chunks(SupplyItem.objects.values_list('pk', 'lead_time_days', 'unit_cost')):
+        chunk = np.array(chunk, dtype=np.float64)
+        pks = chunk[:, 0].astype(np.int64)
+        lead_time_days[pks] = chunk[:, 1]
+        unit_cost[pks] = chunk[:, 2]
+
+    ids = np.flatnonzero(units)
+    figures = reorder_points(
+        units=units[ids],
+        squares=squares[ids],
+        lead_time_days=lead_time_days[ids],
+        unit_cost=unit_cost[ids],
+        window_days=window_days,
+        service_level=service_level or settings.FORECAST_SERVICE_LEVEL,
+        order_cost=order_cost if order_cost is not None else settings.FORECAST_ORDER_COST,
+        holding_rate=holding_rate or settings.FORECAST_HOLDING_RATE,
+    )
+
+    write_suggestions(zip(
+        ids.tolist(),
+        *(figures[name].tolist() for name in SUGGESTION_FIELDS[1:6]),
+        repeat(window_days),
+        repeat(connection.ops.adapt_datetimefield_value(now)),
+    ))
+    return len(ids)
+
+
+def apply_reorder_suggestions():
+    """Copy suggested reorder points into SupplyItem.reorder_level. Returns the number of items changed."""
+    with transaction.atomic():
+        changed = SupplyItem.objects.filter(reorder_suggestion__isnull=False).exclude(
+            reorder_level=F('reorder_suggestion__reorder_point'),
+        ).update(reorder_level=Subquery(
+            ReorderSuggestion.objects.filter(supply_item=OuterRef('pk')).values('reorder_point')[:1]
+        ))
+        if changed:
+            rebuild_reorder_queue()
+            transaction.on_commit(bump_catalog_version)
+    return changed
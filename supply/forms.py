@@ -34,6 +34,26 @@ class SupplyItemForm(forms.ModelForm):
             'expiration_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
         }
 
+class SupplyItemImportRowForm(SupplyItemForm):
+    """
+    Validates one imported catalog row like SupplyItemForm, minus the image
+    upload and the item_id uniqueness check (existing SKUs are updated).
+    """
+    class Meta(SupplyItemForm.Meta):
+        fields = [field for field in SupplyItemForm.Meta.fields if field != 'supply_image']
+
+    def validate_unique(self):
+        pass
+
+class SupplyItemUploadForm(forms.Form):
+    FORMAT_CHOICES = [
+        ('', 'Detect from file name'),
+        ('csv', 'CSV'),
+        ('json', 'JSON / JSON Lines'),
+    ]
+    file = forms.FileField(widget=forms.ClearableFileInput(attrs={'class': 'form-control-file'}))
+    format = forms.ChoiceField(choices=FORMAT_CHOICES, required=False, widget=forms.Select(attrs={'class': 'form-control'}))
+
 class UserProfileForm(forms.ModelForm):
     class Meta:
         model = CustomUser
@@ -58,13 +78,13 @@ class SupplierProfileForm(forms.ModelForm):
             'address': forms.Textarea(attrs={'class': 'form-control', 'placeholder': 'Address', 'rows': 3}),
         }
 
-class SupplierSupplyItemsForm(forms.ModelForm):
-    class Meta:
-        model = SupplierProfile
-        fields = ['supply_items']
-        widgets = {
-            'supply_items': forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'}),
-        }
+class SupplierSupplyItemsForm(forms.Form):
+    # Choices come from the item picker's JSON endpoint; validating the
+    # submitted ids is one pk__in query, and rendering never lists the catalog
+    supply_items = forms.ModelMultipleChoiceField(
+        queryset=SupplyItem.objects.all(),
+        widget=forms.MultipleHiddenInput,
+    )
     
 class SupplyItemTransactionForm(forms.ModelForm):
     class Meta:
@@ -76,6 +96,16 @@ class SupplyItemTransactionForm(forms.ModelForm):
             'quantity': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Quantity'}),
         }
 
+class TransactionExportFilterForm(forms.Form):
+    # Customer requests are recorded with transaction_type 'REQUEST' by handle_supply_request
+    TYPE_CHOICES = [('', 'All types'), ('REQUEST', 'Request')] + SupplyItemTransaction.TRANSACTION_TYPES
+    STATUS_CHOICES = [('', 'All statuses')] + SupplyItemTransaction.TRANSACTION_STATUS
+
+    date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    transaction_type = forms.ChoiceField(choices=TYPE_CHOICES, required=False, widget=forms.Select(attrs={'class': 'form-control'}))
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False, widget=forms.Select(attrs={'class': 'form-control'}))
+
 class SupplierLoginForm(forms.Form):
     username = forms.CharField(max_length=255, widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Username'}))
     password = forms.CharField(max_length=255, widget=forms.PasswordInput(attrs={'class': 'form-control', 'placeholder': 'Password'}))
@@ -0,0 +1,126 @@
+import io
+import logging
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Widths, in pixels, of the resized copies written next to each supply_image
+VARIANT_WIDTHS = (160, 320, 640)
+
+# format: (Pillow format, file extension, save options)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor = None
+
+
+def variant_name(name, width, fmt):
+    """
+    Storage name of one variant, e.g. supply_images/variants/drill.png_320.webp.
+    The original's extension stays in, so drill.png and drill.jpg never share variants.
+    """
+    directory, filename = posixpath.split(str(name))
+    return posixpath.join(directory, 'variants', f'{filename}_{width}.{VARIANT_FORMATS[fmt][1]}')
+
+
+def has_variants(name):
+    """Checks storage; pages read SupplyItem.image_variants instead."""
+    # The widest variant of the last format is written last
+    return default_storage.exists(variant_name(name, VARIANT_WIDTHS[-1], list(VARIANT_FORMATS)[-1]))
+
+
+def mark_variants_ready(name):
+    """Flag the items using image ``name`` once its variants are written."""
+    # Spawned pool workers import this module before Django is set up
+    from supply.catalog import bump_catalog_version
+    from supply.models import SupplyItem
+
+    if SupplyItem.objects.filter(supply_image=name, image_variants=False).update(image_variants=True):
+        # The customer catalog caches the flag with each entry
+        bump_catalog_version()
+
+
+def srcset(name, fmt='webp'):
+    """A srcset value for the variants of ``name``; only use it once they exist."""
+    if not name:
+        return ''
+    return ', '.join(
+        f'{default_storage.url(variant_name(name, width, fmt))} {width}w' for width in VARIANT_WIDTHS
+    )
+
+
+def generate_variants(name, force=False):
+    """
+    Write every width/format variant of the stored image ``name``.
+
+    Runs in pool worker processes, so it only touches storage, never the
+    database. Returns (original bytes, bytes of the smallest WebP variant).
+    """
+    from PIL import Image, ImageOps
+
+    if has_variants(name) and not force:
+        return default_storage.size(name), default_storage.size(variant_name(name, VARIANT_WIDTHS[0], 'webp'))
+
+    with default_storage.open(name, 'rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    for width in VARIANT_WIDTHS:
+        resized = image.copy()
+        resized.thumbnail((width, width * 4), Image.LANCZOS)
+        for fmt, (pil_format, _, options) in VARIANT_FORMATS.items():
+            frame = resized.convert('RGB') if pil_format == 'JPEG' else resized
+            buffer = io.BytesIO()
+            frame.save(buffer, pil_format, **options)
+            target = variant_name(name, width, fmt)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+
+    return default_storage.size(name), default_storage.size(variant_name(name, VARIANT_WIDTHS[0], 'webp'))
+
+
+def _init_worker():
+    # Spawned (non-fork) workers start without Django configured
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(settings.IMAGE_VARIANT_WORKERS, initializer=_init_worker)
+    return _executor
+
+
+def _finish(name, future):
+    if future.exception() is not None:
+        logger.error("Could not generate variants for %s", name, exc_info=future.exception())
+        return
+    try:
+        mark_variants_ready(name)
+    except Exception:
+        logger.exception("Could not record the variants of %s", name)
+    finally:
+        # Done callbacks run on the pool's management thread; do not leave its connection open
+        connections.close_all()
+
+
+def schedule_variants(name):
+    """Generate the variants of ``name`` in the background process pool, then flag its items."""
+    future = get_executor().submit(generate_variants, str(name))
+    future.add_done_callback(lambda done: _finish(name, done))
+    return future
@@ -0,0 +1,157 @@
+import csv
+import json
+import re
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from supply.catalog import bump_catalog_version
+from supply.forms import SupplyItemImportRowForm
+from supply.models import StockMovement, SupplyItem
+from supply.reorder import refresh_reorder_queue
+
+IMPORT_FIELDS = SupplyItemImportRowForm.Meta.fields
+UPDATE_FIELDS = [field for field in IMPORT_FIELDS if field != 'item_id'] + ['last_updated', 'updated_at']
+# Whitespace and array punctuation between JSON objects
+JSON_SEPARATORS = re.compile(r'[\s,\[\]]*')
+
+
+class ImportReport:
+    """Running totals for one import, keeping at most ``max_errors`` rejected rows."""
+
+    def __init__(self, max_errors=1000):
+        self.created = 0
+        self.updated = 0
+        self.rejected = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def reject(self, row_number, errors):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row_number, errors))
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.rejected
+
+
+def detect_format(filename):
+    return 'csv' if filename.lower().endswith('.csv') else 'json'
+
+
+def iter_csv_rows(stream):
+    yield from csv.DictReader(stream)
+
+
+def iter_json_rows(stream, read_size=64 * 1024, max_object_size=1024 * 1024):
+    """
+    Yield objects from a JSON array or JSON Lines stream without loading the
+    whole document, decoding one object at a time from a rolling buffer.
+
+    An object that still fails to decode once ``max_object_size`` characters
+    of it are buffered is treated as malformed, so a syntax error fails fast
+    instead of reading on to the end of the file.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    while True:
+        pos = JSON_SEPARATORS.match(buffer, pos).end()
+        if pos < len(buffer):
+            try:
+                obj, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof or len(buffer) - pos >= max_object_size:
+                    raise
+            else:
+                yield obj
+                continue
+        elif eof:
+            return
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_rows(stream, fmt):
+    return iter_csv_rows(stream) if fmt == 'csv' else iter_json_rows(stream)
+
+
+def import_supply_items(stream, fmt='csv', chunk_size=1000, report=None):
+    """
+    Stream supply item rows from ``stream`` and upsert them on ``item_id``.
+
+    Each chunk of ``chunk_size`` rows is validated with SupplyItemImportRowForm,
+    then written with one bulk_create and one bulk_update, so memory stays
+    bounded by the chunk size rather than the file size.
+    """
+    report = report or ImportReport()
+    rows = enumerate(iter_rows(stream, fmt), start=1)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return report
+        _import_chunk(chunk, report)
+
+
+def _import_chunk(chunk, report):
+    valid, row_numbers = {}, {}
+    for row_number, row in chunk:
+        if not isinstance(row, dict):
+            report.reject(row_number, {'__all__': [{'message': 'Row is not an object.', 'code': 'invalid'}]})
+            continue
+        data = {field: row.get(field) for field in IMPORT_FIELDS}
+        form = SupplyItemImportRowForm(data=data)
+        if form.is_valid():
+            item_id = form.instance.item_id
+            if item_id in row_numbers:
+                # A SKU repeated within the chunk keeps its last row; report the earlier one
+                report.reject(row_numbers[item_id], {'item_id': [{
+                    'message': f'Superseded by row {row_number}, which has the same item_id.',
+                    'code': 'superseded',
+                }]})
+            valid[item_id] = form.instance
+            row_numbers[item_id] = row_number
+        else:
+            report.reject(row_number, form.errors.get_json_data())
+
+    if not valid:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = (
+            SupplyItem.objects.filter(item_id__in=valid)
+            .only('id', 'item_id', 'quantity')
+            .in_bulk(field_name='item_id')
+        )
+        to_create, to_update, deltas = [], [], {}
+        for item_id, item in valid.items():
+            current = existing.get(item_id)
+            if current is None:
+                to_create.append(item)
+                deltas[item_id] = item.quantity
+            else:
+                item.pk = current.pk
+                item.last_updated = item.updated_at = now
+                to_update.append(item)
+                deltas[item_id] = item.quantity - current.quantity
+        SupplyItem.objects.bulk_create(to_create)
+        SupplyItem.objects.bulk_update(to_update, UPDATE_FIELDS)
+
+        # bulk writes skip save() and post_save, so do the ledger and reorder queue here
+        ids = dict(SupplyItem.objects.filter(item_id__in=valid).values_list('item_id', 'id'))
+        StockMovement.objects.bulk_create([
+            StockMovement(supply_item_id=ids[item_id], delta=delta, reason='IMPORT')
+            for item_id, delta in deltas.items()
+            if delta
+        ])
+        refresh_reorder_queue(ids.values())
+        transaction.on_commit(bump_catalog_version)
+
+    report.created += len(to_create)
+    report.updated += len(to_update)
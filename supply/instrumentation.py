@@ -0,0 +1,168 @@
+"""
+Per-request SQL and latency instrumentation.
+
+RequestMetricsMiddleware records every query a request runs (count, total
+time and repeated statement fingerprints, the signature of N+1 loops) plus
+the view latency. It reports them in response headers and logs requests over
+budget. query_budget() and assert_view_query_budget() apply the same
+accounting to a block of code or a single view, for scripted checks such as
+`manage.py check_query_budgets`.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('supply.metrics')
+
+_IN_LIST_RE = re.compile(r'IN \((?:%s, )*%s\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """SQL with parameters left as placeholders and IN lists collapsed, so repeats group together."""
+    return _WHITESPACE_RE.sub(' ', _IN_LIST_RE.sub('IN (...)', sql)).strip()
+
+
+class QueryRecorder:
+    """A database execute wrapper that counts, times and fingerprints queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    @property
+    def duplicates(self):
+        """Queries that repeated an earlier statement fingerprint."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def repeated(self, threshold=2):
+        """(fingerprint, count) pairs run at least ``threshold`` times, most repeated first."""
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+
+class RequestMetricsMiddleware:
+    """
+    Adds X-DB-Query-Count, X-DB-Query-Time-Ms, X-DB-Duplicate-Queries and a
+    Server-Timing header when REQUEST_METRICS_HEADERS is on, and logs a
+    warning for requests over REQUEST_QUERY_BUDGET, REQUEST_LATENCY_BUDGET_MS
+    or with a statement repeated REQUEST_N_PLUS_ONE_THRESHOLD times.
+
+    Queries run while a streaming response is consumed are not included.
+    Works in both sync and async stacks, so async views are not adapted to
+    run in a thread on its account.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        return self.report(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        # Async ORM calls run on the request's thread-sensitive worker thread;
+        # connections are per thread, so wrap the ones on that thread
+        stack = ExitStack()
+        await sync_to_async(stack.enter_context)(recorder.record())
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, recorder, started)
+
+    def report(self, request, response, recorder, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+
+        if settings.REQUEST_METRICS_HEADERS:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Query-Time-Ms'] = f'{db_ms:.1f}'
+            response['X-DB-Duplicate-Queries'] = str(recorder.duplicates)
+            response['Server-Timing'] = f'db;dur={db_ms:.1f};desc="{recorder.count} queries", view;dur={elapsed_ms:.1f}'
+
+        repeated = recorder.repeated(settings.REQUEST_N_PLUS_ONE_THRESHOLD)
+        if (
+            recorder.count > settings.REQUEST_QUERY_BUDGET
+            or elapsed_ms > settings.REQUEST_LATENCY_BUDGET_MS
+            or repeated
+        ):
+            logger.warning(
+                "%s %s over budget: %d queries (%d duplicates) in %.1f ms, %.1f ms total%s",
+                request.method,
+                request.path,
+                recorder.count,
+                recorder.duplicates,
+                db_ms,
+                elapsed_ms,
+                ''.join(f"\n  {count}x {sql[:200]}" for sql, count in repeated[:5]),
+            )
+        return response
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries, max_repeats=None, label='block'):
+    """
+    Fail with QueryBudgetExceeded if the block runs more than ``max_queries``
+    queries, or any single statement more than ``max_repeats`` times.
+    """
+    recorder = QueryRecorder()
+    with recorder.record():
+        yield recorder
+
+    problems = []
+    if recorder.count > max_queries:
+        problems.append(f"{recorder.count} queries (budget {max_queries})")
+    if max_repeats is not None:
+        problems.extend(
+            f"{count}x (max {max_repeats}) {sql[:200]}"
+            for sql, count in recorder.repeated(max_repeats + 1)
+        )
+    if problems:
+        raise QueryBudgetExceeded(f"{label}: " + '; '.join(problems))
+
+
+def assert_view_query_budget(client, url, max_queries, max_repeats=1, **request_kwargs):
+    """GET ``url`` with a test client within a query budget and return the response."""
+    with query_budget(max_queries, max_repeats, label=url):
+        response = client.get(url, **request_kwargs)
+    if response.status_code != 200:
+        raise QueryBudgetExceeded(f"{url}: status {response.status_code}")
+    return response
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from supply.models import StockMovement, StockSnapshot, SupplyItem
+
+# Movements younger than this may still belong to open transactions, so a
+# snapshot leaves them in the tail rather than risk skipping a late commit.
+SNAPSHOT_SETTLE_TIME = timedelta(seconds=60)
+
+
+def record_movement(supply_item_id, delta, reason, supply_request=None):
+    return StockMovement.objects.create(
+        supply_item_id=supply_item_id,
+        delta=delta,
+        reason=reason,
+        supply_request=supply_request,
+    )
+
+
+def _latest_snapshot(supply_item_id, at=None):
+    snapshots = StockSnapshot.objects.filter(supply_item_id=supply_item_id)
+    if at is not None:
+        snapshots = snapshots.filter(taken_at__lte=at)
+    return snapshots.order_by('-taken_at', '-last_movement_id').first()
+
+
+def stock_at(supply_item_id, at=None):
+    """
+    Quantity of an item at time ``at`` (now if omitted): the nearest earlier
+    snapshot plus the movements recorded after it.
+    """
+    snapshot = _latest_snapshot(supply_item_id, at)
+    movements = StockMovement.objects.filter(
+        supply_item_id=supply_item_id,
+        id__gt=snapshot.last_movement_id if snapshot else 0,
+    )
+    if at is not None:
+        movements = movements.filter(created_at__lte=at)
+    tail = movements.aggregate(total=Sum('delta'))['total'] or 0
+    return (snapshot.quantity if snapshot else 0) + tail
+
+
+def take_snapshots(chunk_size=2000):
+    """
+    Fold every settled movement since the previous run into a new snapshot
+    for each item that moved. Returns the number of snapshots written.
+    """
+    settled_before = timezone.now() - SNAPSHOT_SETTLE_TIME
+    previous_cutoff = StockSnapshot.objects.aggregate(cutoff=Max('last_movement_id'))['cutoff'] or 0
+    cutoff = StockMovement.objects.filter(
+        id__gt=previous_cutoff, created_at__lt=settled_before
+    ).aggregate(cutoff=Max('id'))['cutoff']
+    if cutoff is None:
+        return 0
+
+    moved = (
+        StockMovement.objects.filter(id__gt=previous_cutoff, id__lte=cutoff)
+        .values('supply_item_id')
+        .annotate(delta=Sum('delta'))
+        .order_by('supply_item_id')
+    )
+    previous_quantity = Subquery(
+        StockSnapshot.objects.filter(supply_item_id=OuterRef('pk'))
+        .order_by('-last_movement_id')
+        .values('quantity')[:1]
+    )
+
+    written = 0
+    with transaction.atomic():
+        batch = []
+        for row in moved.iterator(chunk_size=chunk_size):
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                written += _write_snapshots(batch, previous_quantity, cutoff, settled_before)
+                batch = []
+        written += _write_snapshots(batch, previous_quantity, cutoff, settled_before)
+    return written
+
+
+def _write_snapshots(rows, previous_quantity, cutoff, taken_at):
+    if not rows:
+        return 0
+    base = dict(
+        SupplyItem.objects.filter(pk__in=[row['supply_item_id'] for row in rows])
+        .annotate(snapshot_quantity=previous_quantity)
+        .values_list('pk', 'snapshot_quantity')
+    )
+    snapshots = [
+        StockSnapshot(
+            supply_item_id=row['supply_item_id'],
+            quantity=(base.get(row['supply_item_id']) or 0) + row['delta'],
+            last_movement_id=cutoff,
+            taken_at=taken_at,
+        )
+        for row in rows
+        if row['supply_item_id'] in base
+    ]
+    StockSnapshot.objects.bulk_create(snapshots)
+    return len(snapshots)
+
+
+def find_ledger_mismatches():
+    """Yield (supply_item_id, quantity, ledger_quantity) for items whose ledger disagrees."""
+    items = SupplyItem.objects.order_by('pk').values_list('pk', 'quantity')
+    for pk, quantity in items.iterator(chunk_size=2000):
+        ledger_quantity = stock_at(pk)
+        if ledger_quantity != quantity:
+            yield pk, quantity, ledger_quantity
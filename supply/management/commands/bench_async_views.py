@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.contrib.auth.models import Permission
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from supply.benchmarking import scratch_database, summarize
+from supply.models import (
+    CustomerProfile,
+    CustomUser,
+    SupplyItem,
+    SupplyItemRequest,
+    SupplyManagerProfile,
+)
+
+# (sync url name, async url name, role that may view it)
+ENDPOINTS = {
+    'catalog': ('customer_requestable_supply', 'async_customer_requestable_supply', 'customer'),
+    'history': ('customer_supply_request_list', 'async_customer_supply_request_list', 'customer'),
+    'pending': ('customer_pending_requests', 'async_customer_pending_requests', 'supply_manager'),
+    'detail': ('supplyitem_detail', 'async_supplyitem_detail', 'supply_manager'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync views behind concurrent WSGI worker threads with their "
+        "async counterparts behind concurrent ASGI tasks, on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint and mode.")
+        parser.add_argument('--items', type=int, default=500)
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        with scratch_database(on_disk=True):
+            users, item = self.create_data(options['items'])
+            results = {}
+            for endpoint in options['endpoints']:
+                sync_name, async_name, role = ENDPOINTS[endpoint]
+                kwargs = {'pk': item.pk} if endpoint == 'detail' else {}
+                results[endpoint] = {
+                    'wsgi': self.run_wsgi(
+                        reverse(f'supply:{sync_name}', kwargs=kwargs), users[role],
+                        options['concurrency'], options['requests'],
+                    ),
+                    'asgi': asyncio.run(self.run_asgi(
+                        reverse(f'supply:{async_name}', kwargs=kwargs), users[role],
+                        options['concurrency'], options['requests'],
+                    )),
+                }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'endpoint':<10}{'mode':<6}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}")
+        for endpoint, modes in results.items():
+            for mode, result in modes.items():
+                self.stdout.write(
+                    f"{endpoint:<10}{mode:<6}{result['p50_ms']:>10.2f}"
+                    f"{result['p95_ms']:>10.2f}{result['requests_per_second']:>10.1f}"
+                )
+
+    def create_data(self, item_count):
+        customer_user = CustomUser.objects.create_user('bench-customer', password='bench', user_type='customer')
+        customer = CustomerProfile.objects.create(user=customer_user, address='Benchmark')
+        manager_user = CustomUser.objects.create_user('bench-manager', password='bench', user_type='supply_manager')
+        manager_user.user_permissions.add(Permission.objects.get(codename='view_supplyitem'))
+        SupplyManagerProfile.objects.create(user=manager_user, first_name='Bench', last_name='Manager', employee_id='B1')
+        items = SupplyItem.objects.bulk_create([
+            SupplyItem(
+                item_id=f'BENCH-{i}', name=f'Bench item {i}', category='bench',
+                unit_of_measure='pc', unit_cost=1, quantity=100, status='ACTIVE',
+            )
+            for i in range(item_count)
+        ])
+        SupplyItemRequest.objects.bulk_create([
+            SupplyItemRequest(supply_item=item, customer=customer, quantity=1)
+            for item in items
+        ])
+        return {'customer': customer_user, 'supply_manager': manager_user}, items[0]
+
+    def run_wsgi(self, url, user, concurrency, requests):
+        def worker(count):
+            client = Client()
+            client.force_login(user)
+            latencies = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, (url, response.status_code)
+            return latencies
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            batches = list(pool.map(worker, self.split(requests, concurrency)))
+        return self.result(batches, time.perf_counter() - started)
+
+    async def run_asgi(self, url, user, concurrency, requests):
+        async def worker(count):
+            client = AsyncClient()
+            await client.aforce_login(user)
+            latencies = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, (url, response.status_code)
+            return latencies
+
+        started = time.perf_counter()
+        batches = await asyncio.gather(*(worker(count) for count in self.split(requests, concurrency)))
+        return self.result(batches, time.perf_counter() - started)
+
+    def split(self, requests, concurrency):
+        return [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+
+    def result(self, batches, seconds):
+        latencies = [latency for batch in batches for latency in batch]
+        return summarize(latencies, requests_per_second=round(len(latencies) / seconds, 1))
@@ -0,0 +1,116 @@
+import json
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from supply.benchmarking import scratch_database
+from supply.models import CustomerProfile, CustomUser, SupplyItem
+from supply.services import InsufficientStock, submit_supply_request
+
+
+WAL_PRAGMAS = 'PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL;'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent request-submission throughput on a throwaway database. "
+        "On SQLite it compares Django's default connection settings with the tuned "
+        "profile from settings.DATABASE_ENGINES, with and without WAL mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--writes', type=int, default=100, help="Submissions per thread.")
+        parser.add_argument('--items', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            tuned = settings.DATABASE_ENGINES['sqlite']['OPTIONS']
+            profiles = {
+                'default': {},
+                'tuned': tuned,
+                # WAL is opt-in (DATABASE_SQLITE_WAL); measure it on the scratch file either way
+                'tuned+wal': {
+                    **tuned,
+                    'init_command': tuned['init_command'] + WAL_PRAGMAS,
+                },
+            }
+        else:
+            profiles = {connection.vendor: connection.settings_dict['OPTIONS']}
+
+        results = {name: self.run_profile(db_options, options) for name, db_options in profiles.items()}
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'profile':<12}{'ok':>8}{'locked':>8}{'seconds':>10}{'writes/s':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<12}{result['succeeded']:>8}{result['locked']:>8}"
+                f"{result['seconds']:>10.2f}{result['writes_per_second']:>10.1f}"
+            )
+
+    def run_profile(self, db_options, options):
+        settings_dict = connection.settings_dict
+        saved_options = settings_dict['OPTIONS']
+        settings_dict['OPTIONS'] = db_options
+        try:
+            with scratch_database(on_disk=True):
+                customer, items = self.create_data(options['items'], options['threads'] * options['writes'])
+                connection.close()
+                return self.run_threads(customer, items, options['threads'], options['writes'])
+        finally:
+            settings_dict['OPTIONS'] = saved_options
+
+    def create_data(self, item_count, total_writes):
+        user = CustomUser.objects.create_user('bench-customer', password='bench', user_type='customer')
+        customer = CustomerProfile.objects.create(user=user, address='Benchmark')
+        items = SupplyItem.objects.bulk_create([
+            SupplyItem(
+                item_id=f'BENCH-{i}', name=f'Bench item {i}', category='bench',
+                unit_of_measure='pc', unit_cost=1, quantity=total_writes, status='ACTIVE',
+            )
+            for i in range(item_count)
+        ])
+        return customer, items
+
+    def run_threads(self, customer, items, thread_count, writes):
+        counts = {'succeeded': 0, 'locked': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def worker():
+            local = {'succeeded': 0, 'locked': 0, 'errors': 0}
+            try:
+                for _ in range(writes):
+                    try:
+                        submit_supply_request(random.choice(items), customer, 1)
+                        local['succeeded'] += 1
+                    except OperationalError as exc:
+                        local['locked' if 'locked' in str(exc) else 'errors'] += 1
+                    except InsufficientStock:
+                        local['errors'] += 1
+            finally:
+                connection.close()
+                with lock:
+                    for key, value in local.items():
+                        counts[key] += value
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        return {
+            **counts,
+            'threads': thread_count,
+            'seconds': round(seconds, 3),
+            'writes_per_second': round(counts['succeeded'] / seconds, 1),
+        }
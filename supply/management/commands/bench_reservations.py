@@ -0,0 +1,102 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection
+
+from supply.benchmarking import scratch_database
+from supply.models import SupplyItem
+from supply.services import reserve_stock
+
+
+def naive_reserve(supply_item_id, quantity):
+    """The old read-check-save reservation, kept here for comparison."""
+    item = SupplyItem.objects.get(pk=supply_item_id)
+    if item.quantity < quantity:
+        return False
+    item.quantity -= quantity
+    item.save(update_fields=['quantity'])
+    return True
+
+
+STRATEGIES = {
+    'conditional': reserve_stock,
+    'naive': naive_reserve,
+}
+
+
+class Command(BaseCommand):
+    help = "Hammer one supply item with concurrent reservations on a throwaway database and check for oversell."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=100, help="Reservations attempted per thread.")
+        parser.add_argument('--stock', type=int, default=1000)
+        parser.add_argument('--quantity', type=int, default=1, help="Units per reservation.")
+        parser.add_argument('--strategy', choices=[*STRATEGIES, 'all'], default='all')
+
+    def handle(self, *args, **options):
+        names = list(STRATEGIES) if options['strategy'] == 'all' else [options['strategy']]
+        with scratch_database(on_disk=True):
+            for name in names:
+                # A fresh item per strategy, so every run starts from --stock through the ledger
+                item = SupplyItem.objects.create(
+                    item_id=f'BENCH-{name}',
+                    name='Reservation benchmark item',
+                    category='benchmark',
+                    unit_of_measure='pc',
+                    unit_cost=0,
+                    quantity=options['stock'],
+                )
+                connection.close()
+                self.report(name, self.run(STRATEGIES[name], item.pk, options), item.pk, options)
+
+    def run(self, reserve, supply_item_id, options):
+        results = {'reserved': 0, 'refused': 0, 'errors': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'] + 1)
+
+        def worker():
+            counts = {'reserved': 0, 'refused': 0, 'errors': 0}
+            barrier.wait()
+            try:
+                for _ in range(options['attempts']):
+                    try:
+                        ok = reserve(supply_item_id, options['quantity'])
+                    except DatabaseError:
+                        counts['errors'] += 1
+                    else:
+                        counts['reserved' if ok else 'refused'] += 1
+            finally:
+                connection.close()
+            with lock:
+                for key, value in counts.items():
+                    results[key] += value
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        results['elapsed'] = time.perf_counter() - started
+        return results
+
+    def report(self, name, results, supply_item_id, options):
+        final = SupplyItem.objects.values_list('quantity', flat=True).get(pk=supply_item_id)
+        granted = results['reserved'] * options['quantity']
+        deducted = options['stock'] - final
+        oversold = granted - deducted
+        attempts = results['reserved'] + results['refused'] + results['errors']
+        self.stdout.write(
+            f"{name:>12}: {results['reserved']} reserved, {results['refused']} refused, "
+            f"{results['errors']} errors in {results['elapsed']:.2f}s "
+            f"({attempts / results['elapsed']:.0f} attempts/s, "
+            f"{results['reserved'] / results['elapsed']:.0f} reservations/s)"
+        )
+        message = f"{'':>12}  granted {granted} units, stock fell by {deducted}, final stock {final}"
+        if oversold:
+            self.stdout.write(self.style.ERROR(f"{message} -> OVERSOLD {oversold} units"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{message} -> no oversell"))
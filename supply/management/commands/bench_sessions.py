@@ -0,0 +1,93 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from supply.benchmarking import scratch_database, summarize
+from supply.models import CustomerProfile, CustomUser, SupplyItem
+
+# A private cache for the run; clearing the configured one would log every
+# user out of a cache-backed session engine and drop the catalog caches
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench-sessions',
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request latency and database load of each session backend "
+        "on an authenticated customer page, using a throwaway test database and a "
+        "private in-memory cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per backend.")
+        parser.add_argument(
+            '--backends',
+            nargs='+',
+            choices=list(settings.SESSION_ENGINES),
+            default=list(settings.SESSION_ENGINES),
+        )
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        with scratch_database(), override_settings(CACHES=BENCH_CACHES):
+            user = self.create_customer()
+            results = {
+                backend: self.run_backend(backend, user, options['requests'])
+                for backend in options['backends']
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'backend':<16}{'p50 ms':>10}{'p95 ms':>10}{'queries/req':>14}{'session q/req':>16}")
+        for backend, result in results.items():
+            self.stdout.write(
+                f"{backend:<16}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['queries_per_request']:>14.2f}{result['session_queries_per_request']:>16.2f}"
+            )
+
+    def create_customer(self):
+        user = CustomUser.objects.create_user('bench-customer', password='bench', user_type='customer')
+        CustomerProfile.objects.create(user=user, address='Benchmark')
+        SupplyItem.objects.bulk_create([
+            SupplyItem(
+                item_id=f'BENCH-{i}', name=f'Bench item {i}', category='bench',
+                unit_of_measure='pc', unit_cost=1, quantity=100, status='ACTIVE',
+            )
+            for i in range(50)
+        ])
+        return user
+
+    def run_backend(self, backend, user, requests):
+        cache.clear()
+        url = reverse('supply:customer_requestable_supply')
+        with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[backend]):
+            client = Client()
+            client.force_login(user)
+            client.get(url)  # warm caches
+
+            latencies, queries, session_queries = [], 0, 0
+            for _ in range(requests):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    client.get(url)
+                    latencies.append(time.perf_counter() - started)
+                queries += len(captured.captured_queries)
+                session_queries += sum('django_session' in query['sql'] for query in captured.captured_queries)
+
+        return summarize(
+            latencies,
+            queries_per_request=queries / requests,
+            session_queries_per_request=session_queries / requests,
+        )
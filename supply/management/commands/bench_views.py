@@ -0,0 +1,114 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth.models import Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from supply.benchmarking import scratch_database, summarize
+from supply.instrumentation import QueryRecorder
+from supply.models import CustomerProfile, CustomUser, SupplyItem, SupplyManagerProfile
+from supply.synthetic import generate_dataset
+
+# name: (url name, role, method)
+ENDPOINTS = {
+    'catalog': ('customer_requestable_supply', 'customer', 'get'),
+    'history': ('customer_supply_request_list', 'customer', 'get'),
+    'item_list': ('supplyitem_list', 'supply_manager', 'get'),
+    'pending': ('customer_pending_requests', 'supply_manager', 'get'),
+    'transactions': ('supplyitem_transaction', 'supply_manager', 'get'),
+    'submit': ('request_supply_item', 'customer', 'post'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database with synthetic data at each size and report p50/p95 "
+        "latency and query counts of the key endpoints as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[1000, 10000],
+            help="Catalog sizes; suppliers, customers, requests and deliveries scale with them.",
+        )
+        parser.add_argument('--requests', type=int, default=50, help="Requests per endpoint and size.")
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Also write the JSON results to this file.")
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        results = {}
+        for size in options['sizes']:
+            with scratch_database():
+                started = time.perf_counter()
+                counts = generate_dataset(
+                    items=size,
+                    suppliers=max(1, size // 50),
+                    customers=max(1, size // 5),
+                    requests=size * 5,
+                    deliveries=size,
+                    seed=options['seed'],
+                )
+                self.stderr.write(f"{size} items seeded in {time.perf_counter() - started:.1f}s")
+                clients, item = self.create_clients()
+                results[size] = {
+                    'rows': counts,
+                    'endpoints': {
+                        endpoint: self.run(clients, endpoint, item, options['requests'])
+                        for endpoint in options['endpoints']
+                    },
+                }
+
+        output = json.dumps(results, indent=2)
+        self.stdout.write(output)
+        if options['output']:
+            with open(options['output'], 'w') as target:
+                target.write(output)
+
+    def create_clients(self):
+        manager = CustomUser.objects.create_user('bench-manager', password='bench', user_type='supply_manager')
+        manager.user_permissions.add(*Permission.objects.filter(content_type__app_label='supply'))
+        SupplyManagerProfile.objects.create(user=manager, first_name='Bench', last_name='Manager', employee_id='BV1')
+        # The busiest synthetic customer has the longest history
+        customer = CustomerProfile.objects.annotate(
+            requests=Count('supplyitemrequest'),
+        ).order_by('-requests').select_related('user').first()
+
+        clients = {}
+        for role, user in (('supply_manager', manager), ('customer', customer.user)):
+            clients[role] = Client()
+            clients[role].force_login(user)
+        # Submissions go to the best-stocked active item so they never run out
+        item = SupplyItem.objects.filter(status='ACTIVE').order_by('-quantity').first()
+        return clients, item
+
+    def run(self, clients, endpoint, item, requests):
+        url_name, role, method = ENDPOINTS[endpoint]
+        kwargs = {'item_id': item.pk} if endpoint == 'submit' else {}
+        url = reverse(f'supply:{url_name}', kwargs=kwargs)
+        client = clients[role]
+
+        latencies, queries = [], []
+        for _ in range(requests):
+            recorder = QueryRecorder()
+            with recorder.record():
+                started = time.perf_counter()
+                if method == 'post':
+                    response = client.post(url, {'quantity': 1})
+                else:
+                    response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+            queries.append(recorder.count)
+            if response.status_code not in (200, 302):
+                raise CommandError(f"{endpoint}: {url} returned {response.status_code}")
+        return summarize(
+            latencies,
+            queries_median=statistics.median(queries),
+            queries_max=max(queries),
+        )
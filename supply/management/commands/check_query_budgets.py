@@ -0,0 +1,86 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from supply.benchmarking import scratch_database
+from supply.instrumentation import QueryBudgetExceeded, assert_view_query_budget
+from supply.models import (
+    CustomerProfile,
+    CustomUser,
+    SupplierProfile,
+    SupplyItem,
+    SupplyManagerProfile,
+)
+from supply.services import submit_supply_request
+
+# (role, url name, max queries, max repeats of one statement). Budgets hold
+# regardless of row counts, so a view that loops over rows fails them.
+VIEW_QUERY_BUDGETS = [
+    ('supply_manager', 'supplyitem_list', 12, 1),
+    ('supply_manager', 'supplyitem_transaction', 10, 1),
+    ('supply_manager', 'customer_pending_requests', 6, 1),
+    ('supply_manager', 'reorder_queue', 8, 1),
+    ('supply_manager', 'dashboard', 8, 1),
+    ('supply_manager', 'supplyitem_detail', 6, 1),
+    ('customer', 'customer_requestable_supply', 8, 1),
+    ('customer', 'customer_supply_request_list', 6, 1),
+    ('supplier', 'supplier_choose_items', 6, 1),
+    ('supplier', 'supplier_item_picker', 6, 1),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the main views against a throwaway database seeded with many rows and "
+        "fail if any exceeds its query budget or repeats a statement (an N+1 loop)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=40, help="Items and requests to seed.")
+
+    def handle(self, *args, **options):
+        failures = []
+        with scratch_database():
+            users, item = self.create_data(options['rows'])
+            clients = {}
+            for role, user in users.items():
+                clients[role] = Client()
+                clients[role].force_login(user)
+
+            for role, url_name, max_queries, max_repeats in VIEW_QUERY_BUDGETS:
+                kwargs = {'pk': item.pk} if url_name == 'supplyitem_detail' else {}
+                url = reverse(f'supply:{url_name}', kwargs=kwargs)
+                try:
+                    assert_view_query_budget(clients[role], url, max_queries, max_repeats)
+                except QueryBudgetExceeded as exc:
+                    failures.append(str(exc))
+                    self.stdout.write(self.style.ERROR(f"FAIL {exc}"))
+                else:
+                    self.stdout.write(f"ok   {url} (budget {max_queries})")
+
+        if failures:
+            raise CommandError(f"{len(failures)} views over their query budget.")
+
+    def create_data(self, rows):
+        Group.objects.get_or_create(name='Supplier')
+        manager = CustomUser.objects.create_user('budget-manager', password='budget', user_type='supply_manager')
+        manager.user_permissions.add(*Permission.objects.filter(content_type__app_label='supply'))
+        SupplyManagerProfile.objects.create(user=manager, first_name='Budget', last_name='Manager', employee_id='QB1')
+        customer_user = CustomUser.objects.create_user('budget-customer', password='budget', user_type='customer')
+        customer = CustomerProfile.objects.create(user=customer_user, address='Budget')
+        supplier_user = CustomUser.objects.create_user('budget-supplier', password='budget', user_type='supplier')
+        supplier = SupplierProfile.objects.get(user=supplier_user)
+
+        items = SupplyItem.objects.bulk_create([
+            SupplyItem(
+                item_id=f'QB-{i}', name=f'Budget item {i}', category=f'cat{i % 4}',
+                unit_of_measure='pc', unit_cost=1, quantity=i % 15, status='ACTIVE',
+            )
+            for i in range(rows)
+        ])
+        supplier.supply_items.add(*items[::2])
+        for item in items:
+            if item.quantity:
+                submit_supply_request(item, customer, 1)
+        return {'supply_manager': manager, 'customer': customer_user, 'supplier': supplier_user}, items[0]
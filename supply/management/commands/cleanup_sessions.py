@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+DB_ENGINES = {
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches so cleanup never holds a long "
+        "write lock. Schedule it from cron, or pass --every to keep it running."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--every', type=int, help="Repeat every N seconds instead of running once.")
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = self.cleanup(options['batch_size'])
+            self.stdout.write(f"Deleted {deleted} expired sessions.")
+            if not options['every']:
+                return
+            time.sleep(options['every'])
+
+    def cleanup(self, batch_size):
+        if settings.SESSION_ENGINE not in DB_ENGINES:
+            # Other backends expire entries themselves or have their own clear_expired()
+            call_command('clearsessions')
+            return 0
+
+        deleted = 0
+        now = timezone.now()
+        while True:
+            batch = list(
+                Session.objects.filter(expire_date__lt=now).values_list('pk', flat=True)[:batch_size]
+            )
+            if not batch:
+                return deleted
+            deleted += Session.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from supply.forecasting import apply_reorder_suggestions, forecast_reorder_levels
+
+
+class Command(BaseCommand):
+    help = (
+        "Forecast every item's demand from its request history and write suggested reorder "
+        "levels (ReorderSuggestion). With --apply, copy them into SupplyItem.reorder_level."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window-days', type=int, default=settings.FORECAST_WINDOW_DAYS)
+        parser.add_argument('--service-level', type=float, default=settings.FORECAST_SERVICE_LEVEL)
+        parser.add_argument('--order-cost', type=float, default=settings.FORECAST_ORDER_COST)
+        parser.add_argument('--holding-rate', type=float, default=settings.FORECAST_HOLDING_RATE)
+        parser.add_argument('--apply', action='store_true', help="Update reorder_level from the suggestions.")
+
+    def handle(self, *args, **options):
+        if not 0 < options['service_level'] < 1:
+            raise CommandError("--service-level must be between 0 and 1.")
+        if options['window_days'] < 1 or options['holding_rate'] <= 0:
+            raise CommandError("--window-days and --holding-rate must be positive.")
+
+        started = time.perf_counter()
+        try:
+            written = forecast_reorder_levels(
+                window_days=options['window_days'],
+                service_level=options['service_level'],
+                order_cost=options['order_cost'],
+                holding_rate=options['holding_rate'],
+            )
+        except ImproperlyConfigured as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} reorder suggestions in {time.perf_counter() - started:.1f}s."
+        ))
+
+        if options['apply']:
+            started = time.perf_counter()
+            changed = apply_reorder_suggestions()
+            self.stdout.write(self.style.SUCCESS(
+                f"Updated the reorder level of {changed} items in {time.perf_counter() - started:.1f}s."
+            ))
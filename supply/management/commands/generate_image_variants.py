@@ -0,0 +1,44 @@
+from concurrent.futures import as_completed
+
+from django.core.management.base import BaseCommand
+
+from supply.images import generate_variants, get_executor, mark_variants_ready
+from supply.models import SupplyItem
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate thumbnail and WebP variants for existing supply images in the "
+        "image process pool, and report the page weight saved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate variants that already exist.")
+
+    def handle(self, *args, **options):
+        names = (
+            SupplyItem.objects.exclude(supply_image='').exclude(supply_image__isnull=True)
+            .values_list('supply_image', flat=True).distinct().iterator()
+        )
+        executor = get_executor()
+        futures = {executor.submit(generate_variants, name, options['force']): name for name in names}
+
+        done = failed = original_bytes = thumbnail_bytes = 0
+        for future in as_completed(futures):
+            try:
+                original, thumbnail = future.result()
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{futures[future]}: {exc}")
+                continue
+            mark_variants_ready(futures[future])
+            done += 1
+            original_bytes += original
+            thumbnail_bytes += thumbnail
+
+        self.stdout.write(self.style.SUCCESS(f"Generated variants for {done} images ({failed} failed)."))
+        if thumbnail_bytes:
+            self.stdout.write(
+                f"Originals: {original_bytes:,} bytes; smallest WebP variants: {thumbnail_bytes:,} bytes "
+                f"({original_bytes / thumbnail_bytes:.0f}x smaller)."
+            )
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from supply.synthetic import SYNTHETIC_PASSWORD, generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-insert a synthetic catalog with suppliers, customers, requests, deliveries and "
+        "the matching stock ledger, with production-like skew. Repeatable for a given --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=1000)
+        parser.add_argument('--suppliers', type=int, default=20)
+        parser.add_argument('--customers', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--deliveries', type=int, default=1000, help="Supplier delivery transactions.")
+        parser.add_argument('--days', type=int, default=180, help="How far back the history goes.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        counts = generate_dataset(
+            items=options['items'],
+            suppliers=options['suppliers'],
+            customers=options['customers'],
+            requests=options['requests'],
+            deliveries=options['deliveries'],
+            days=options['days'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
+        elapsed = time.perf_counter() - started
+        summary = ', '.join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Created {summary} in {elapsed:.1f}s."))
+        self.stdout.write(f"Synthetic accounts log in with the password '{SYNTHETIC_PASSWORD}'.")
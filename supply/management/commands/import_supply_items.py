@@ -0,0 +1,66 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from supply.importers import ImportReport, detect_format, import_supply_items
+
+
+class ErrorFileReport(ImportReport):
+    """Writes every rejected row straight to a CSV writer instead of keeping it."""
+
+    def __init__(self, writer):
+        super().__init__(max_errors=0)
+        self.writer = writer
+
+    def reject(self, row_number, errors):
+        super().reject(row_number, errors)
+        self.writer.writerow([row_number, json.dumps(errors)])
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV, JSON or JSON Lines supplier catalog into SupplyItem, upserting on item_id."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or - for stdin.")
+        parser.add_argument('--format', choices=['csv', 'json'], help="Defaults to the file extension.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--errors', help="Write every rejected row and its errors to this CSV file.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('csv' if path == '-' else detect_format(path))
+
+        error_file = None
+        if options['errors']:
+            error_file = open(options['errors'], 'w', newline='')
+            writer = csv.writer(error_file)
+            writer.writerow(['row', 'errors'])
+            report = ErrorFileReport(writer)
+        else:
+            report = ImportReport(max_errors=20)
+
+        try:
+            if path == '-':
+                import_supply_items(sys.stdin, fmt, options['chunk_size'], report)
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as stream:
+                    import_supply_items(stream, fmt, options['chunk_size'], report)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Import stopped after {report.processed} rows: {e}")
+        except IntegrityError as e:
+            raise CommandError(
+                f"Import stopped after {report.processed} rows: another import added the same items "
+                f"at the same time ({e}). Run the import again to update them."
+            )
+        finally:
+            if error_file:
+                error_file.close()
+
+        for row_number, errors in report.errors:
+            self.stdout.write(self.style.WARNING(f"row {row_number}: {json.dumps(errors)}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.created} created, {report.updated} updated, {report.rejected} rejected."
+        ))
@@ -0,0 +1,244 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from django.contrib.messages import constants, get_messages
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from django.db.models import Sum
+from django.test import Client
+from django.urls import reverse
+
+from supply.benchmarking import scratch_database, summarize
+from supply.ledger import find_ledger_mismatches
+from supply.models import (
+    CustomerProfile,
+    CustomUser,
+    SupplyItem,
+    SupplyItemRequest,
+    SupplyManagerProfile,
+)
+
+# Outcomes counted as errors in the error rate
+ERROR_OUTCOMES = ('locked', 'database_error', 'exception', 'http_error', 'failed')
+
+
+def classify(response):
+    """Outcome of a redirecting form view, read from the messages it queued."""
+    if response.status_code >= 400:
+        return 'http_error'
+    levels = [(message.level, str(message)) for message in get_messages(response.wsgi_request)]
+    if any(level == constants.SUCCESS for level, _ in levels):
+        return 'ok'
+    for level, text in levels:
+        if 'locked' in text:
+            return 'locked'
+        if 'exceeds available stock' in text:
+            return 'out_of_stock'
+        if 'not in pending status' in text:
+            return 'already_reviewed'
+        if level == constants.ERROR:
+            return 'failed'
+    return 'ok'
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent simulated customers submitting requests and managers approving them "
+        "through the full view stack (middleware, views, signals) on a throwaway copy of the "
+        "configured database. Reports throughput, error rates and final stock consistency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=8, help="Concurrent customer threads.")
+        parser.add_argument('--managers', type=int, default=2, help="Concurrent manager threads.")
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run.")
+        parser.add_argument('--items', type=int, default=20, help="Fewer items means more contention.")
+        parser.add_argument('--stock', type=int, default=1000, help="Starting stock of each item.")
+        parser.add_argument('--max-quantity', type=int, default=3, help="Units per request, 1 to this.")
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        if options['customers'] < 1 and options['managers'] < 1:
+            raise CommandError("Run at least one customer or manager.")
+        with scratch_database(on_disk=True):
+            users, items = self.create_data(options)
+            connection.close()
+            results = self.run(users, items, options)
+            results['consistency'] = self.check_consistency(items, options['stock'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.report(results)
+
+    def create_data(self, options):
+        users = {'customer': [], 'supply_manager': []}
+        for number in range(options['customers']):
+            user = CustomUser.objects.create_user(f'load-customer-{number}', password='load', user_type='customer')
+            CustomerProfile.objects.create(user=user, address='Load test')
+            users['customer'].append(user)
+        for number in range(options['managers']):
+            user = CustomUser.objects.create_user(
+                f'load-manager-{number}', password='load', user_type='supply_manager',
+            )
+            SupplyManagerProfile.objects.create(
+                user=user, first_name='Load', last_name=str(number), employee_id=f'LT{number}',
+            )
+            users['supply_manager'].append(user)
+        items = [
+            SupplyItem.objects.create(
+                item_id=f'LOAD-{number}', name=f'Load item {number}', category='load',
+                unit_of_measure='pc', unit_cost=1, quantity=options['stock'], status='ACTIVE',
+            )
+            for number in range(options['items'])
+        ]
+        return users, [item.pk for item in items]
+
+    def run(self, users, item_ids, options):
+        outcomes = {'submit': Counter(), 'approve': Counter()}
+        latencies = {'submit': [], 'approve': []}
+        lock = threading.Lock()
+        # Pending request ids a manager has already taken, so two managers rarely race for one
+        claimed = set()
+        stop = threading.Event()
+        barrier = threading.Barrier(len(users['customer']) + len(users['supply_manager']) + 1)
+        rng = random.Random(options['seed'])
+
+        def call(action, send):
+            started = time.perf_counter()
+            try:
+                outcome = classify(send())
+            except DatabaseError as exc:
+                outcome = 'locked' if 'locked' in str(exc) else 'database_error'
+            except Exception:
+                outcome = 'exception'
+            elapsed = time.perf_counter() - started
+            with lock:
+                outcomes[action][outcome] += 1
+                latencies[action].append(elapsed)
+
+        def customer(client, seed):
+            local_rng = random.Random(seed)
+            barrier.wait()
+            try:
+                while not stop.is_set():
+                    url = reverse('supply:request_supply_item', args=[local_rng.choice(item_ids)])
+                    quantity = local_rng.randint(1, options['max_quantity'])
+                    call('submit', lambda: client.post(url, {'quantity': quantity}))
+                    # Drop delivered messages so the cookie does not grow into the session
+                    client.cookies.pop('messages', None)
+            finally:
+                connection.close()
+
+        def manager(client):
+            barrier.wait()
+            try:
+                while not stop.is_set():
+                    try:
+                        pending = list(
+                            SupplyItemRequest.objects.filter(status='PENDING')
+                            .order_by('request_date').values_list('pk', flat=True)[:20]
+                        )
+                    except DatabaseError:
+                        with lock:
+                            outcomes['approve']['locked'] += 1
+                        continue
+                    with lock:
+                        pending = [pk for pk in pending if pk not in claimed]
+                        claimed.update(pending[:1])
+                    if not pending:
+                        time.sleep(0.005)
+                        continue
+                    url = reverse('supply:approve_request', args=[pending[0]])
+                    call('approve', lambda: client.post(url))
+                    client.cookies.pop('messages', None)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=customer, args=(self.client_for(user), rng.random()))
+            for user in users['customer']
+        ] + [
+            threading.Thread(target=manager, args=(self.client_for(user),))
+            for user in users['supply_manager']
+        ]
+        connection.close()
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        results = {'seconds': round(seconds, 3)}
+        for action in ('submit', 'approve'):
+            counts = outcomes[action]
+            attempts = sum(counts.values())
+            errors = sum(counts[outcome] for outcome in ERROR_OUTCOMES)
+            results[action] = summarize(
+                latencies[action],
+                outcomes=dict(counts),
+                succeeded_per_second=round(counts['ok'] / seconds, 1),
+                error_rate=round(errors / attempts, 4) if attempts else 0.0,
+            )
+        return results
+
+    def client_for(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+    def check_consistency(self, item_ids, stock):
+        """Stock must equal the starting stock minus every request still holding a reservation."""
+        reserved = dict(
+            SupplyItemRequest.objects.filter(supply_item_id__in=item_ids).exclude(status='REJECTED')
+            .values_list('supply_item_id').annotate(total=Sum('quantity')).order_by()
+        )
+        quantities = dict(SupplyItem.objects.filter(pk__in=item_ids).values_list('pk', 'quantity'))
+        drifted = {
+            pk: {'quantity': quantity, 'expected': stock - reserved.get(pk, 0)}
+            for pk, quantity in quantities.items()
+            if quantity != stock - reserved.get(pk, 0)
+        }
+        requests = SupplyItemRequest.objects.filter(supply_item_id__in=item_ids)
+        return {
+            'requests_created': requests.count(),
+            'requests_reviewed': requests.exclude(status='PENDING').count(),
+            'units_reserved': sum(reserved.values()),
+            'items_drifted': drifted,
+            'ledger_mismatches': len(list(find_ledger_mismatches())),
+            'consistent': not drifted,
+        }
+
+    def report(self, results):
+        seconds = results['seconds']
+        self.stdout.write(f"Ran for {seconds:.1f}s")
+        self.stdout.write(
+            f"{'action':<9}{'attempts':>9}{'ok/s':>8}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}  outcomes"
+        )
+        for action in ('submit', 'approve'):
+            result = results[action]
+            outcomes = ', '.join(f"{name} {count}" for name, count in sorted(result['outcomes'].items()))
+            self.stdout.write(
+                f"{action:<9}{result['requests']:>9}{result['succeeded_per_second']:>8.1f}"
+                f"{result['error_rate']:>8.1%}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}  {outcomes}"
+            )
+
+        consistency = results['consistency']
+        summary = (
+            f"{consistency['requests_created']} requests created, {consistency['requests_reviewed']} reviewed, "
+            f"{consistency['units_reserved']} units reserved, {consistency['ledger_mismatches']} ledger mismatches"
+        )
+        if consistency['consistent'] and not consistency['ledger_mismatches']:
+            self.stdout.write(self.style.SUCCESS(f"Stock consistent: {summary}"))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f"Stock INCONSISTENT on {len(consistency['items_drifted'])} items: {summary}"
+            ))
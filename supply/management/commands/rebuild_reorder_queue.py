@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from supply.reorder import rebuild_reorder_queue
+
+
+class Command(BaseCommand):
+    help = "Recompute the reorder queue from scratch from current SupplyItem stock."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        total = rebuild_reorder_queue(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Reorder queue rebuilt: {total} items at or below reorder level."))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from supply.ledger import find_ledger_mismatches, take_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold recent stock movements into per-item snapshots. Schedule it "
+        "(e.g. hourly from cron) to keep point-in-time stock lookups short."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help="Also check every item's quantity against its ledger and fail on any mismatch.",
+        )
+
+    def handle(self, *args, **options):
+        written = take_snapshots(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} stock snapshots."))
+
+        if options['verify']:
+            mismatches = 0
+            for pk, quantity, ledger_quantity in find_ledger_mismatches():
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(
+                    f"SupplyItem {pk}: quantity {quantity}, ledger says {ledger_quantity}"
+                ))
+            if mismatches:
+                raise CommandError(f"{mismatches} items disagree with the stock ledger.")
+            self.stdout.write(self.style.SUCCESS("Stock ledger matches every item's quantity."))
@@ -0,0 +1,29 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from supply.staticfiles import COMPRESSION_REPORT_NAME
+
+
+class Command(BaseCommand):
+    help = "Show the bytes saved by the precompressed copies written by the last collectstatic."
+
+    def handle(self, *args, **options):
+        try:
+            with open(f'{settings.STATIC_ROOT}/{COMPRESSION_REPORT_NAME}') as source:
+                report = json.load(source)
+        except FileNotFoundError:
+            raise CommandError("No compression report; run collectstatic with STATIC_MANIFEST enabled first.")
+
+        original = report['original_bytes']
+        self.stdout.write(f"Compressible files: {report['files']} ({original:,} bytes)")
+        for label, key in (('gzip', 'gzip_bytes'), ('brotli', 'brotli_bytes')):
+            if key == 'brotli_bytes' and not report['brotli']:
+                self.stdout.write("brotli: not installed, no .br copies written")
+                continue
+            size = report[key]
+            self.stdout.write(
+                f"{label}: {size:,} bytes, saved {original - size:,} bytes "
+                f"({(original - size) / original:.0%})" if original else f"{label}: nothing to compress"
+            )
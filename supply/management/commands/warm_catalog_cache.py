@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from supply.catalog import catalog_cache_stats, reset_catalog_cache_stats, warm_catalog_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-build the first customer catalog page and its facet cache for the current catalog version. "
+        "Needs a shared (file or redis) cache; locmem is private to this process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stats', action='store_true', help="Only print the cache hit/miss counters.")
+        parser.add_argument('--reset-stats', action='store_true', help="Zero the hit/miss counters.")
+
+    def handle(self, *args, **options):
+        if not settings.CACHE_IS_SHARED:
+            # Entries and counters would live and die in this process; no web worker would see them
+            raise CommandError(
+                f"CACHE_BACKEND={settings.CACHE_BACKEND} is private to each process, so there is "
+                "nothing to warm or report. Set CACHE_BACKEND to file or redis."
+            )
+        if options['reset_stats']:
+            reset_catalog_cache_stats()
+        if not options['stats']:
+            count = warm_catalog_cache()
+            self.stdout.write(self.style.SUCCESS(f"Cached the first catalog page ({count} items) and its facets."))
+
+        stats = catalog_cache_stats()
+        self.stdout.write(
+            f"version {stats['version']}: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']:.1%} hit rate)"
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0019_alter_supplyitemtransaction_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplyitemrequest',
+            name='supply_transaction',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='supply_request', to='supply.supplyitemtransaction'),
+        ),
+        migrations.AlterField(
+            model_name='supplyitemrequest',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('FOR DELIVERY', 'For Delivery'), ('FOR RETURN', 'For Return'), ('COMPLETED', 'Completed'), ('REJECTED', 'Rejected')], default='PENDING', max_length=20),
+        ),
+    ]
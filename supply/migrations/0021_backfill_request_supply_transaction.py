@@ -0,0 +1,58 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import migrations
+
+# The signal writes a request's transaction right after the request itself
+MAX_LINK_DELAY = timedelta(minutes=1)
+
+
+def link_requests_to_transactions(apps, schema_editor):
+    """
+    Pair each existing request with the REQUEST transaction the signal made
+    for it: same item, customer and quantity, and the first one written at or
+    after the request. Requests are matched newest-first, so an older request
+    whose transaction is missing cannot take a later request's transaction.
+    """
+    SupplyItemRequest = apps.get_model('supply', 'SupplyItemRequest')
+    SupplyItemTransaction = apps.get_model('supply', 'SupplyItemTransaction')
+
+    candidates = defaultdict(list)
+    transactions = (
+        SupplyItemTransaction.objects
+        .filter(transaction_type='REQUEST', supply_request__isnull=True)
+        .order_by('transaction_date', 'id')
+        .values_list('id', 'supply_item_id', 'customer_id', 'quantity', 'transaction_date')
+    )
+    for pk, supply_item_id, customer_id, quantity, transaction_date in transactions.iterator(chunk_size=2000):
+        candidates[(supply_item_id, customer_id, quantity)].append((transaction_date, pk))
+
+    links = []
+    requests = (
+        SupplyItemRequest.objects
+        .filter(supply_transaction__isnull=True)
+        .order_by('-request_date', '-id')
+        .values_list('id', 'supply_item_id', 'customer_id', 'quantity', 'request_date')
+    )
+    for pk, supply_item_id, customer_id, quantity, request_date in requests.iterator(chunk_size=2000):
+        matches = candidates.get((supply_item_id, customer_id, quantity))
+        if not matches:
+            continue
+        index = bisect_left(matches, (request_date,))
+        if index < len(matches) and matches[index][0] - request_date <= MAX_LINK_DELAY:
+            links.append(SupplyItemRequest(id=pk, supply_transaction_id=matches.pop(index)[1]))
+
+    # Write after reading so the updates never race the open cursor
+    SupplyItemRequest.objects.bulk_update(links, ['supply_transaction'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0020_supplyitemrequest_supply_transaction'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_requests_to_transactions, migrations.RunPython.noop),
+    ]
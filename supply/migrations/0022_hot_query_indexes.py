@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0021_backfill_request_supply_transaction'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supplyitem',
+            index=models.Index(fields=['name', 'id'], name='supplyitem_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitem',
+            index=models.Index(fields=['status', 'name'], name='supplyitem_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitemrequest',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-request_date'], name='request_pending_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitemrequest',
+            index=models.Index(fields=['status', '-request_date'], name='request_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitemrequest',
+            index=models.Index(fields=['customer', '-request_date'], name='request_customer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitemtransaction',
+            index=models.Index(fields=['transaction_date', 'id'], name='transaction_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplyitemtransaction',
+            index=models.Index(fields=['supply_item', 'customer', 'transaction_type'], name='transaction_item_cust_type_idx'),
+        ),
+    ]
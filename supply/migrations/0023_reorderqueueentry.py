@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0022_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReorderQueueEntry',
+            fields=[
+                ('supply_item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reorder_entry', serialize=False, to='supply.supplyitem')),
+                ('quantity', models.PositiveIntegerField()),
+                ('reorder_level', models.PositiveIntegerField()),
+                ('shortfall', models.IntegerField(help_text='reorder_level - quantity')),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Reorder Queue Entry',
+                'verbose_name_plural': 'Reorder Queue',
+                'indexes': [models.Index(fields=['-shortfall', 'supply_item'], name='reorder_shortfall_idx'), models.Index(fields=['queued_at', 'supply_item'], name='reorder_queued_at_idx')],
+            },
+        ),
+    ]
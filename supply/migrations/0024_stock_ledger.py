@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0023_reorderqueueentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField()),
+                ('reason', models.CharField(choices=[('OPENING', 'Opening Balance'), ('RESERVE', 'Reserved for Request'), ('RELEASE', 'Released from Request'), ('ADJUSTMENT', 'Manual Adjustment'), ('IMPORT', 'Catalog Import')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('supply_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='supply.supplyitem')),
+                ('supply_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='supply.supplyitemrequest')),
+            ],
+            options={
+                'verbose_name': 'Stock Movement',
+                'verbose_name_plural': 'Stock Movements',
+                'indexes': [models.Index(fields=['supply_item', 'id'], name='stockmovement_item_id_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.IntegerField()),
+                ('last_movement_id', models.BigIntegerField()),
+                ('taken_at', models.DateTimeField()),
+                ('supply_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='supply.supplyitem')),
+            ],
+            options={
+                'verbose_name': 'Stock Snapshot',
+                'verbose_name_plural': 'Stock Snapshots',
+                'indexes': [models.Index(fields=['supply_item', 'taken_at'], name='stocksnapshot_item_taken_idx'), models.Index(fields=['last_movement_id'], name='stocksnapshot_last_move_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def record_opening_balances(apps, schema_editor):
+    """Start the ledger with one OPENING movement per item that holds stock."""
+    SupplyItem = apps.get_model('supply', 'SupplyItem')
+    StockMovement = apps.get_model('supply', 'StockMovement')
+
+    items = SupplyItem.objects.filter(quantity__gt=0).order_by('id').values_list('id', 'quantity')
+    movements = [
+        StockMovement(supply_item_id=pk, delta=quantity, reason='OPENING')
+        for pk, quantity in items.iterator(chunk_size=2000)
+    ]
+    StockMovement.objects.bulk_create(movements, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0024_stock_ledger'),
+    ]
+
+    operations = [
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+from supply.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0025_opening_stock_balances'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SupplyItemSearchEntry',
+            fields=[
+                ('supply_item', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='supply.supplyitem')),
+            ],
+            options={
+                'db_table': 'supply_supplyitem_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
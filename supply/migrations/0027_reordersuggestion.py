@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0026_supplyitem_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReorderSuggestion',
+            fields=[
+                ('supply_item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reorder_suggestion', serialize=False, to='supply.supplyitem')),
+                ('daily_demand', models.FloatField(help_text='Mean units requested per day')),
+                ('demand_std', models.FloatField(help_text='Standard deviation of daily demand')),
+                ('safety_stock', models.PositiveIntegerField()),
+                ('reorder_point', models.PositiveIntegerField()),
+                ('economic_order_quantity', models.PositiveIntegerField()),
+                ('window_days', models.PositiveIntegerField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Reorder Suggestion',
+                'verbose_name_plural': 'Reorder Suggestions',
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0027_reordersuggestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyCategoryRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(max_length=100)),
+                ('transaction_type', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily Category Rollup',
+                'verbose_name_plural': 'Daily Category Rollups',
+                'constraints': [models.UniqueConstraint(fields=('day', 'category', 'transaction_type', 'status'), name='daily_category_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyItemRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('transaction_type', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('quantity', models.IntegerField(default=0)),
+                ('supply_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='supply.supplyitem')),
+            ],
+            options={
+                'verbose_name': 'Daily Item Rollup',
+                'verbose_name_plural': 'Daily Item Rollups',
+                'indexes': [models.Index(fields=['day'], name='daily_item_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('supply_item', 'day', 'transaction_type', 'status'), name='daily_item_rollup_unique')],
+            },
+        ),
+    ]
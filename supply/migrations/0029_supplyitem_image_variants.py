@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0028_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplyitem',
+            name='image_variants',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+    ]
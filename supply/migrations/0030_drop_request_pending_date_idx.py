@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0029_supplyitem_image_variants'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='supplyitemrequest',
+            name='request_pending_date_idx',
+        ),
+    ]
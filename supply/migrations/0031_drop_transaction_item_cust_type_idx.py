@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0030_drop_request_pending_date_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='supplyitemtransaction',
+            name='transaction_item_cust_type_idx',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def uppercase_statuses(apps, schema_editor):
+    """Legacy rows defaulted to lowercase 'active'; store every status as its choice value."""
+    SupplyItem = apps.get_model('supply', 'SupplyItem')
+    SupplyItem.objects.exclude(status__in=['ACTIVE', 'INACTIVE', 'DISCONTINUED']).update(status=Upper('status'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supply', '0031_drop_transaction_item_cust_type_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='supplyitem',
+            name='status',
+            field=models.CharField(choices=[('ACTIVE', 'Active'), ('INACTIVE', 'Inactive'), ('DISCONTINUED', 'Discontinued')], default='ACTIVE', max_length=20),
+        ),
+        migrations.RunPython(uppercase_statuses, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractUser, Group, Permission
-from django.db import models
+from django.db import models, transaction
 
 # ---------------------------------------------------------
 #region Custom User Model
@@ -110,8 +110,10 @@ class SupplyItem(models.Model):
     reorder_level = models.PositiveIntegerField(default=10)
     unit_cost = models.DecimalField(max_digits=10, decimal_places=2)
     # Status and additional fields
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     supply_image = models.ImageField(upload_to='supply_images/', blank=True, null=True)
+    # Whether the resized variants of supply_image exist, so pages never stat storage to find out
+    image_variants = models.BooleanField(default=False, editable=False)
     lead_time_days = models.PositiveIntegerField(default=7)
     expiration_date = models.DateField(blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True)
@@ -123,10 +125,31 @@ class SupplyItem(models.Model):
         ordering = ['name']
         verbose_name = 'Supply Item'
         verbose_name_plural = 'Supply Items'
+        indexes = [
+            # Catalog list keyset pagination and status-filtered catalog
+            models.Index(fields=['name', 'id'], name='supplyitem_name_id_idx'),
+            models.Index(fields=['status', 'name'], name='supplyitem_status_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # Record quantity changes in the stock ledger within the same transaction
+        update_fields = kwargs.get('update_fields')
+        tracks_quantity = update_fields is None or 'quantity' in update_fields
+        with transaction.atomic():
+            previous = 0
+            if tracks_quantity and self.pk is not None:
+                previous = SupplyItem.objects.filter(pk=self.pk).values_list('quantity', flat=True).first() or 0
+            super().save(*args, **kwargs)
+            if tracks_quantity and self.quantity != previous:
+                StockMovement.objects.create(
+                    supply_item=self,
+                    delta=self.quantity - previous,
+                    reason='ADJUSTMENT',
+                )
+
 # ---------------------------------------------------------
 #region Supply Item Transaction
 # ---------------------------------------------------------
@@ -156,6 +179,12 @@ class SupplyItemTransaction(models.Model):
     status = models.CharField(max_length=20, choices=TRANSACTION_STATUS, default='NEW')
     transaction_date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Transaction history keyset pagination
+            models.Index(fields=['transaction_date', 'id'], name='transaction_date_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.transaction_type} - {self.supply_item.name}" 
 
@@ -180,6 +209,220 @@ class SupplyItemRequest(models.Model):
         ],
         default='PENDING'
     )
+    # The transaction created for this request by the post_save signal
+    supply_transaction = models.OneToOneField(
+        SupplyItemTransaction,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='supply_request',
+    )
+
+    class Meta:
+        indexes = [
+            # Pending queue (and every other status filter), newest first
+            models.Index(fields=['status', '-request_date'], name='request_status_date_idx'),
+            # Per-customer request history
+            models.Index(fields=['customer', '-request_date'], name='request_customer_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Request for {self.supply_item.name} by {self.customer.user.username}"
+
+# ---------------------------------------------------------
+#region Reorder Queue
+# ---------------------------------------------------------
+class ReorderQueueEntry(models.Model):
+    """
+    One row per supply item at or below its reorder level, kept in step with
+    stock changes by supply.reorder so managers never scan the catalog.
+    """
+    supply_item = models.OneToOneField(
+        SupplyItem,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='reorder_entry',
+    )
+    quantity = models.PositiveIntegerField()
+    reorder_level = models.PositiveIntegerField()
+    shortfall = models.IntegerField(help_text='reorder_level - quantity')
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Reorder Queue Entry'
+        verbose_name_plural = 'Reorder Queue'
+        indexes = [
+            models.Index(fields=['-shortfall', 'supply_item'], name='reorder_shortfall_idx'),
+            models.Index(fields=['queued_at', 'supply_item'], name='reorder_queued_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"Reorder {self.supply_item_id} (short {self.shortfall})"
+
+
+class ReorderSuggestion(models.Model):
+    """
+    Demand statistics and the suggested reorder point for one item, written
+    in bulk by supply.forecasting. Applying a suggestion copies
+    reorder_point into SupplyItem.reorder_level.
+    """
+    supply_item = models.OneToOneField(
+        SupplyItem,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='reorder_suggestion',
+    )
+    daily_demand = models.FloatField(help_text='Mean units requested per day')
+    demand_std = models.FloatField(help_text='Standard deviation of daily demand')
+    safety_stock = models.PositiveIntegerField()
+    reorder_point = models.PositiveIntegerField()
+    economic_order_quantity = models.PositiveIntegerField()
+    window_days = models.PositiveIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Reorder Suggestion'
+        verbose_name_plural = 'Reorder Suggestions'
+
+    def __str__(self):
+        return f"Reorder {self.supply_item_id} at {self.reorder_point} (EOQ {self.economic_order_quantity})"
+
+
+# ---------------------------------------------------------
+#region Stock Ledger
+# ---------------------------------------------------------
+class StockMovement(models.Model):
+    """
+    Append-only record of every change to SupplyItem.quantity. The sum of an
+    item's deltas always equals its current quantity.
+    """
+    REASON_CHOICES = [
+        ('OPENING', 'Opening Balance'),
+        ('RESERVE', 'Reserved for Request'),
+        ('RELEASE', 'Released from Request'),
+        ('ADJUSTMENT', 'Manual Adjustment'),
+        ('IMPORT', 'Catalog Import'),
+    ]
+
+    supply_item = models.ForeignKey(SupplyItem, on_delete=models.CASCADE, related_name='stock_movements')
+    delta = models.IntegerField()
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+    supply_request = models.ForeignKey(
+        'SupplyItemRequest',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stock_movements',
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Stock Movement'
+        verbose_name_plural = 'Stock Movements'
+        indexes = [
+            models.Index(fields=['supply_item', 'id'], name='stockmovement_item_id_idx'),
+        ]
 
     def __str__(self):
-        return f"Request for {self.supply_item.name} by {self.customer.user.username}"
\ No newline at end of file
+        return f"{self.supply_item_id}: {self.delta:+d} ({self.reason})"
+
+
+class StockSnapshot(models.Model):
+    """
+    An item's quantity after folding in every movement up to last_movement_id,
+    so point-in-time stock only replays the short tail after it.
+    """
+    supply_item = models.ForeignKey(SupplyItem, on_delete=models.CASCADE, related_name='stock_snapshots')
+    quantity = models.IntegerField()
+    last_movement_id = models.BigIntegerField()
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'Stock Snapshot'
+        verbose_name_plural = 'Stock Snapshots'
+        indexes = [
+            models.Index(fields=['supply_item', 'taken_at'], name='stocksnapshot_item_taken_idx'),
+            models.Index(fields=['last_movement_id'], name='stocksnapshot_last_move_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.supply_item_id}: {self.quantity} at {self.taken_at:%Y-%m-%d %H:%M}"
+
+
+# ---------------------------------------------------------
+#region Daily Rollups
+# ---------------------------------------------------------
+class DailyItemRollup(models.Model):
+    """
+    Transactions per day, item, type and status, kept up to date by
+    supply.rollups on every transaction write so reports never aggregate
+    SupplyItemTransaction itself.
+    """
+    day = models.DateField()
+    supply_item = models.ForeignKey(SupplyItem, on_delete=models.CASCADE, related_name='daily_rollups')
+    transaction_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    transaction_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Daily Item Rollup'
+        verbose_name_plural = 'Daily Item Rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['supply_item', 'day', 'transaction_type', 'status'],
+                name='daily_item_rollup_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='daily_item_rollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.supply_item_id} {self.transaction_type}/{self.status}: {self.transaction_count}"
+
+
+class DailyCategoryRollup(models.Model):
+    """Transactions per day, item category, type and status; see DailyItemRollup."""
+    day = models.DateField()
+    category = models.CharField(max_length=100)
+    transaction_type = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    transaction_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Daily Category Rollup'
+        verbose_name_plural = 'Daily Category Rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category', 'transaction_type', 'status'],
+                name='daily_category_rollup_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.category} {self.transaction_type}/{self.status}: {self.transaction_count}"
+
+
+# ---------------------------------------------------------
+#region Supply Item Search Index
+# ---------------------------------------------------------
+class SupplyItemSearchEntry(models.Model):
+    """
+    A row of the SQLite FTS5 index over SupplyItem. The table is created and
+    kept in sync by supply.search, never by Django; joining through it lets
+    SQLite drive a search from the index instead of matching per row.
+    """
+    supply_item = models.OneToOneField(
+        SupplyItem,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column='rowid',
+        db_constraint=False,
+        related_name='search_entry',
+    )
+
+    class Meta:
+        managed = False
+        db_table = 'supply_supplyitem_fts'
@@ -0,0 +1,164 @@
+import base64
+import copy
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    One page of a keyset (seek) paginated queryset.
+
+    Mirrors the parts of django's Page that the templates use, but links to
+    neighbouring pages with opaque cursors instead of page numbers.
+    """
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.encode_cursor(self.object_list[0])
+        return None
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row seen on a unique ordering.
+
+    ``ordering`` is a list of field or annotation names (prefix with ``-``
+    for descending) whose last entry must make the ordering unique, e.g.
+    ``['name', 'id']`` or ``['search_rank', 'id']``.
+    Every page costs one indexed ``WHERE ... ORDER BY ... LIMIT`` query no
+    matter how deep it is, unlike OFFSET pagination and ``COUNT(*)``.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = int(per_page)
+        self.fields = [
+            (self._resolve_field(name.lstrip('-')), name.startswith('-'))
+            for name in self.ordering
+        ]
+
+    def _resolve_field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # An annotation: bind a copy of its output field to the annotation name
+            field = copy.copy(self.queryset.query.annotations[name].output_field)
+            field.set_attributes_from_name(name)
+            return field
+
+    def encode_cursor(self, obj):
+        values = [field.value_to_string(obj) for field, _ in self.fields]
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for (field, _), value in zip(self.fields, values)]
+        except (ValueError, TypeError, ValidationError) as e:
+            raise InvalidCursor(cursor) from e
+
+    def _seek(self, values, backwards):
+        """
+        Build the row-value comparison ``(a, b) > (x, y)`` as
+        ``a > x OR (a = x AND b > y)``, honouring per-field direction.
+        """
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.fields, values):
+            lookup = 'lt' if descending != backwards else 'gt'
+            condition |= equal & Q(**{f'{field.attname}__{lookup}': value})
+            equal &= Q(**{field.attname: value})
+        return condition
+
+    def _page_queryset(self, after, before):
+        queryset = self.queryset
+        backwards = before is not None and after is None
+        cursor = before if backwards else after
+        if cursor:
+            queryset = queryset.filter(self._seek(self.decode_cursor(cursor), backwards))
+
+        if backwards:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+        else:
+            ordering = self.ordering
+        return queryset.order_by(*ordering)[:self.per_page + 1], backwards, cursor
+
+    def _make_page(self, rows, backwards, cursor):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            return KeysetPage(rows, self, has_next=True, has_previous=has_more)
+        return KeysetPage(rows, self, has_next=has_more, has_previous=bool(cursor))
+
+    def page(self, after=None, before=None):
+        queryset, backwards, cursor = self._page_queryset(after, before)
+        return self._make_page(list(queryset), backwards, cursor)
+
+    async def apage(self, after=None, before=None):
+        queryset, backwards, cursor = self._page_queryset(after, before)
+        return self._make_page([row async for row in queryset], backwards, cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that swaps OFFSET pagination for keyset pagination.
+
+    Pages are addressed with ``?after=<cursor>`` / ``?before=<cursor>``.
+    """
+    keyset_ordering = ['id']
+
+    def get_keyset_ordering(self):
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.get_keyset_ordering(), page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise Http404("Invalid page cursor.")
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+PERMISSIONS_VERSION_KEY = 'supply:perms:version'
+
+
+def permissions_version():
+    """Bumped whenever a group or permission changes, which can affect any user."""
+    version = cache.get(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        cache.add(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(PERMISSIONS_VERSION_KEY)
+    return version
+
+
+async def apermissions_version():
+    version = await cache.aget(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        await cache.aadd(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(PERMISSIONS_VERSION_KEY)
+    return version
+
+
+def bump_permissions_version():
+    cache.set(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+
+
+def _user_key(user_id):
+    return f'supply:perms:{permissions_version()}:{user_id}'
+
+
+async def _auser_key(user_id):
+    return f'supply:perms:{await apermissions_version()}:{user_id}'
+
+
+def invalidate_user_permissions(user_id):
+    cache.delete(_user_key(user_id))
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose effective permission set is cached across requests,
+    so a warm authenticated request runs no permission queries.
+
+    Entries are dropped per user when their groups, permissions or flags
+    change, and all at once when any group or permission changes. That only
+    reaches every worker through a shared cache, so with
+    PERMISSION_CACHE_TIMEOUT = 0 (the default on locmem) it behaves exactly
+    like ModelBackend.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not settings.PERMISSION_CACHE_TIMEOUT:
+            return super().get_all_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            key = _user_key(user_obj.pk)
+            perms = cache.get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                cache.set(key, perms, settings.PERMISSION_CACHE_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
+
+    async def aget_all_permissions(self, user_obj, obj=None):
+        if not settings.PERMISSION_CACHE_TIMEOUT:
+            return await super().aget_all_permissions(user_obj, obj)
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            key = await _auser_key(user_obj.pk)
+            perms = await cache.aget(key)
+            if perms is None:
+                perms = await super().aget_all_permissions(user_obj)
+                await cache.aset(key, perms, settings.PERMISSION_CACHE_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.db.models import F
+
+from supply.models import ReorderQueueEntry, SupplyItem
+
+
+def _entry(supply_item_id, quantity, reorder_level):
+    return ReorderQueueEntry(
+        supply_item_id=supply_item_id,
+        quantity=quantity,
+        reorder_level=reorder_level,
+        shortfall=reorder_level - quantity,
+    )
+
+
+def refresh_reorder_queue(supply_item_ids):
+    """
+    Bring the queue rows for ``supply_item_ids`` in line with current stock.
+
+    Call this after any change to quantity or reorder_level; it touches only
+    the given items, so the cost is independent of the catalog size.
+    """
+    supply_item_ids = list(supply_item_ids)
+    if not supply_item_ids:
+        return
+    below = [
+        _entry(*row)
+        for row in SupplyItem.objects.filter(
+            pk__in=supply_item_ids, quantity__lte=F('reorder_level')
+        ).values_list('id', 'quantity', 'reorder_level')
+    ]
+    queued = {entry.supply_item_id for entry in below}
+    ReorderQueueEntry.objects.filter(supply_item_id__in=supply_item_ids).exclude(
+        supply_item_id__in=queued
+    ).delete()
+    ReorderQueueEntry.objects.bulk_create(
+        below,
+        update_conflicts=True,
+        unique_fields=['supply_item'],
+        update_fields=['quantity', 'reorder_level', 'shortfall'],
+    )
+
+
+def rebuild_reorder_queue(chunk_size=2000):
+    """Recompute the whole queue from SupplyItem. Returns the number of queued items."""
+    rows = (
+        SupplyItem.objects.filter(quantity__lte=F('reorder_level'))
+        .order_by()
+        .values_list('id', 'quantity', 'reorder_level')
+    )
+    with transaction.atomic():
+        ReorderQueueEntry.objects.all().delete()
+        total = 0
+        batch = []
+        for row in rows.iterator(chunk_size=chunk_size):
+            batch.append(_entry(*row))
+            if len(batch) >= chunk_size:
+                ReorderQueueEntry.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        ReorderQueueEntry.objects.bulk_create(batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,241 @@
+"""
+Daily transaction rollups for reporting.
+
+DailyItemRollup and DailyCategoryRollup hold a transaction count and the
+quantity moved per day, transaction type and status. A write moves one
+transaction from its old rollup key to its new one:
+
+* creates, saves and deletes through the signals in supply.signals;
+* queryset status updates through move_status(), which must run before
+  the update in the same transaction (services.bulk_review_requests does);
+* bulk inserts are not tracked; run backfill_rollups() afterwards
+  (supply.synthetic does) or `manage.py backfill_rollups`.
+
+Days are local dates in settings.TIME_ZONE. Category rollups follow the
+item's category at write time; after recategorizing items, backfill the
+affected days.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, DateField, F, Func, Min, Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from supply.forecasting import raw_chunks
+from supply.models import DailyCategoryRollup, DailyItemRollup, SupplyItem, SupplyItemTransaction
+
+# Days covered by the dashboard trends
+TREND_DAYS = 90
+
+# What a transaction contributes to: (transaction_date, item id, category, type, status, quantity)
+STATE_FIELDS = ('transaction_date', 'supply_item_id', 'supply_item__category', 'transaction_type', 'status', 'quantity')
+
+ITEM_ROLLUP_FIELDS = ('day', 'supply_item', 'transaction_type', 'status', 'transaction_count', 'quantity')
+CATEGORY_ROLLUP_FIELDS = ('day', 'category', 'transaction_type', 'status', 'transaction_count', 'quantity')
+
+
+def local_day(value):
+    if timezone.is_naive(value):
+        # Some views still stamp transaction_date with a naive datetime.now()
+        value = timezone.make_aware(value)
+    return timezone.localdate(value)
+
+
+def transaction_state(row):
+    """A STATE_FIELDS row with its datetime reduced to the local day."""
+    transaction_date, supply_item_id, category, transaction_type, status, quantity = row
+    return (local_day(transaction_date), supply_item_id, category, transaction_type, status, quantity)
+
+
+def stored_state(pk):
+    row = SupplyItemTransaction.objects.filter(pk=pk).values_list(*STATE_FIELDS).first()
+    return transaction_state(row) if row else None
+
+
+def current_state(instance, previous=None):
+    """The rollup state of an in-memory transaction, reusing ``previous`` to avoid looking up its category."""
+    if previous is not None and previous[1] == instance.supply_item_id:
+        category = previous[2]
+    elif SupplyItemTransaction.supply_item.is_cached(instance):
+        category = instance.supply_item.category
+    else:
+        # None once the item is gone; there is then no category row to update
+        category = SupplyItem.objects.filter(pk=instance.supply_item_id).values_list('category', flat=True).first()
+    return (
+        local_day(instance.transaction_date), instance.supply_item_id, category,
+        instance.transaction_type, instance.status, instance.quantity,
+    )
+
+
+def _bump(model, key, count, quantity):
+    updated = model.objects.filter(**key).update(
+        transaction_count=F('transaction_count') + count,
+        quantity=F('quantity') + quantity,
+    )
+    if updated or count <= 0:
+        # Nothing to take away from a key that was never counted (or whose item is gone)
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, transaction_count=count, quantity=quantity)
+    except IntegrityError:
+        # Another writer created the row first
+        model.objects.filter(**key).update(
+            transaction_count=F('transaction_count') + count,
+            quantity=F('quantity') + quantity,
+        )
+
+
+def apply_changes(changes):
+    """
+    Apply (state, sign) pairs, where sign is +1 for a state a transaction
+    entered and -1 for one it left. Opposite changes to the same key cancel.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for state, sign in changes:
+        if state is None:
+            continue
+        day, supply_item_id, category, transaction_type, status, quantity = state
+        for key in (
+            (DailyItemRollup, ('supply_item_id', supply_item_id), day, transaction_type, status),
+            (DailyCategoryRollup, ('category', category), day, transaction_type, status),
+        ):
+            deltas[key][0] += sign
+            deltas[key][1] += sign * quantity
+
+    with transaction.atomic():
+        for (model, (field, value), day, transaction_type, status), (count, quantity) in deltas.items():
+            if count or quantity:
+                key = {field: value, 'day': day, 'transaction_type': transaction_type, 'status': status}
+                _bump(model, key, count, quantity)
+
+
+def move_status(queryset, status):
+    """Record that every transaction in ``queryset`` is about to get ``status``."""
+    changes = []
+    for row in queryset.exclude(status=status).values_list(*STATE_FIELDS):
+        state = transaction_state(row)
+        changes += [(state, -1), (state[:4] + (status, state[5]), 1)]
+    apply_changes(changes)
+
+
+def backfill_rollups(since=None, until=None, batch_days=30, stdout=None):
+    """
+    Rebuild the rollups of the days from ``since`` to ``until`` (dates,
+    default: the whole history) from SupplyItemTransaction, ``batch_days``
+    at a time. Returns the number of item rollup rows written.
+    """
+    bounds = SupplyItemTransaction.objects.aggregate(first=Min('transaction_date'), last=Max('transaction_date'))
+    if bounds['first'] is None:
+        return 0
+    since = since or local_day(bounds['first'])
+    until = until or local_day(bounds['last'])
+
+    written = 0
+    day = since
+    while day <= until:
+        last_day = min(day + timedelta(days=batch_days - 1), until)
+        written += _rebuild_days(day, last_day)
+        if stdout is not None:
+            stdout.write(f"{day} to {last_day}: {written} item rollups so far")
+        day = last_day + timedelta(days=1)
+    return written
+
+
+class UTCDate(Func):
+    """The UTC date of a datetime, computed natively (TruncDate calls back into Python per row on SQLite)."""
+    output_field = DateField()
+    template = 'CAST(%(expressions)s AS DATE)'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='date(%(expressions)s)')
+
+
+def day_expression(field_name):
+    if timezone.get_current_timezone_name() == 'UTC':
+        return UTCDate(field_name)
+    return TruncDate(field_name)
+
+
+def _insert_rows(model, fields, rows):
+    meta = model._meta
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(meta.get_field(name).column) for name in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {quote(meta.db_table)} ({columns}) VALUES ({placeholders})", rows)
+
+
+def _rebuild_days(first_day, last_day):
+    start = timezone.make_aware(datetime.combine(first_day, time.min))
+    end = timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min))
+    groups = (
+        SupplyItemTransaction.objects.filter(transaction_date__gte=start, transaction_date__lt=end)
+        .values_list(day_expression('transaction_date'), 'supply_item', 'transaction_type', 'status')
+        # One category per item, so taking its Min avoids grouping by the text column too
+        .annotate(Count('pk'), Sum('quantity'), Min('supply_item__category'))
+        .order_by()
+    )
+    written = 0
+    categories = defaultdict(lambda: [0, 0])
+    with transaction.atomic():
+        DailyItemRollup.objects.filter(day__range=(first_day, last_day)).delete()
+        DailyCategoryRollup.objects.filter(day__range=(first_day, last_day)).delete()
+        for chunk in raw_chunks(groups):
+            _insert_rows(DailyItemRollup, ITEM_ROLLUP_FIELDS, [row[:6] for row in chunk])
+            for day, _, transaction_type, status, count, quantity, category in chunk:
+                totals = categories[day, category, transaction_type, status]
+                totals[0] += count
+                totals[1] += quantity
+            written += len(chunk)
+        _insert_rows(DailyCategoryRollup, CATEGORY_ROLLUP_FIELDS, [
+            key + tuple(totals) for key, totals in categories.items()
+        ])
+    return written
+
+
+def trends(days=TREND_DAYS, category=None, supply_item=None):
+    """
+    Daily series and totals for the last ``days`` days, answered from the
+    rollups: ``{'days': [...], 'series': {type: {'count': [...], 'quantity': [...]}},
+    'by_status': [...], 'by_category': [...]}``. Narrow to one category or
+    one item (by id) if given.
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    if supply_item is not None:
+        rollups = DailyItemRollup.objects.filter(supply_item_id=supply_item)
+    else:
+        rollups = DailyCategoryRollup.objects.all()
+        if category:
+            rollups = rollups.filter(category=category)
+    rollups = rollups.filter(day__gte=first_day, day__lte=today).order_by()
+
+    day_list = [first_day + timedelta(days=offset) for offset in range(days)]
+    series = {}
+    for row in rollups.values('day', 'transaction_type').annotate(
+        count=Sum('transaction_count'), units=Sum('quantity'),
+    ):
+        points = series.setdefault(row['transaction_type'], {'count': [0] * days, 'quantity': [0] * days})
+        offset = (row['day'] - first_day).days
+        points['count'][offset] = row['count']
+        points['quantity'][offset] = row['units']
+
+    result = {
+        'days': day_list,
+        'series': dict(sorted(series.items())),
+        'by_status': list(
+            rollups.values('transaction_type', 'status')
+            .annotate(count=Sum('transaction_count'), units=Sum('quantity'))
+            .order_by('transaction_type', 'status')
+        ),
+    }
+    if supply_item is None:
+        result['by_category'] = list(
+            rollups.values('category')
+            .annotate(count=Sum('transaction_count'), units=Sum('quantity'))
+            .order_by('-units', 'category')
+        )
+    return result
@@ -0,0 +1,137 @@
+"""
+Ranked full-text search over SupplyItem name, description, category and item_id.
+
+The index lives in the database and is maintained by it, so bulk_create,
+queryset updates and imports stay in sync without signals:
+
+* SQLite: an external-content FTS5 table fed by triggers. Only changes to the
+  indexed columns fire them, so stock updates cost nothing extra.
+* PostgreSQL: a stored generated ``tsvector`` column with a GIN index.
+
+Other databases fall back to ``icontains`` filtering.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'supply_supplyitem_fts'
+FTS_TRIGGERS = ('supply_supplyitem_fts_ai', 'supply_supplyitem_fts_ad', 'supply_supplyitem_fts_au')
+SEARCH_FIELDS = ('name', 'description', 'category', 'item_id')
+
+# bm25 column weights, in SEARCH_FIELDS order
+FTS_WEIGHTS = (10.0, 1.0, 3.0, 10.0)
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, category, item_id,
+        content='supply_supplyitem', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS supply_supplyitem_fts_ai AFTER INSERT ON supply_supplyitem BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, category, item_id)
+        VALUES (new.id, new.name, new.description, new.category, new.item_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS supply_supplyitem_fts_ad AFTER DELETE ON supply_supplyitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, category, item_id)
+        VALUES ('delete', old.id, old.name, old.description, old.category, old.item_id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS supply_supplyitem_fts_au
+        AFTER UPDATE OF name, description, category, item_id ON supply_supplyitem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description, category, item_id)
+        VALUES ('delete', old.id, old.name, old.description, old.category, old.item_id);
+        INSERT INTO {FTS_TABLE}(rowid, name, description, category, item_id)
+        VALUES (new.id, new.name, new.description, new.category, new.item_id);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    *(f"DROP TRIGGER IF EXISTS {trigger}" for trigger in FTS_TRIGGERS),
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRESQL_INSTALL = [
+    """ALTER TABLE supply_supplyitem ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(item_id, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS supplyitem_search_idx ON supply_supplyitem USING GIN (search_vector)",
+]
+
+POSTGRESQL_UNINSTALL = [
+    "DROP INDEX IF EXISTS supplyitem_search_idx",
+    "ALTER TABLE supply_supplyitem DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def install_search_index(schema_editor):
+    """Create (or repair) the search index and fill it from existing rows."""
+    statements = {'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRESQL_INSTALL}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    statements = {'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRESQL_UNINSTALL}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def search_index_needs_repair(using=connection):
+    """
+    SQLite drops the triggers whenever a migration rebuilds supply_supplyitem;
+    report whether the FTS table exists with any of them missing.
+    """
+    if using.vendor != 'sqlite':
+        return False
+    with using.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)",
+            [FTS_TABLE, *FTS_TRIGGERS],
+        )
+        found = {row[0] for row in cursor.fetchall()}
+    return FTS_TABLE in found and not found.issuperset(FTS_TRIGGERS)
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')
+
+
+def search_supply_items(queryset, text):
+    """
+    Filter ``queryset`` to items matching every word of ``text`` (as a
+    prefix) and annotate ``search_rank``, where lower ranks match better.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    table = queryset.model._meta.db_table
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        # Join the FTS table (via SupplyItemSearchEntry) so SQLite matches once
+        # through the index and ranks only the matching rows
+        match = ' '.join(f'"{term}"*' for term in terms)
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        return queryset.filter(search_entry__isnull=False).filter(
+            RawSQL(f"{FTS_TABLE} MATCH %s", [match], output_field=BooleanField())
+        ).annotate(search_rank=RawSQL(
+            f"bm25({FTS_TABLE}, {weights})", [], output_field=FloatField(),
+        ))
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(f"{term}:*" for term in terms)
+        return queryset.filter(RawSQL(
+            f"{table}.search_vector @@ to_tsquery('english', %s)", [tsquery], output_field=BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f"-ts_rank({table}.search_vector, to_tsquery('english', %s))", [tsquery], output_field=FloatField(),
+        ))
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(*(Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS), _connector=Q.OR)
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,168 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from supply.ledger import record_movement
+from supply.catalog import bump_catalog_version
+from supply.facets import item_stock_band
+from supply.models import StockMovement, SupplierProfile, SupplyItem, SupplyItemRequest, SupplyItemTransaction
+from supply.reorder import refresh_reorder_queue
+from supply.rollups import move_status
+
+
+class InsufficientStock(Exception):
+    pass
+
+
+def invalidate_catalog_on_band_change(deltas):
+    """
+    The customer catalog caches stock band filters and counts under the
+    catalog version, so bump it once a stock change moves any item into
+    another band. ``deltas`` maps item ids to the change just applied.
+    """
+    rows = SupplyItem.objects.filter(pk__in=deltas).values_list('id', 'quantity', 'reorder_level')
+    for pk, quantity, reorder_level in rows:
+        if item_stock_band(quantity - deltas[pk], reorder_level) != item_stock_band(quantity, reorder_level):
+            transaction.on_commit(bump_catalog_version)
+            return
+
+
+def reserve_stock(supply_item_id, quantity, supply_request=None):
+    """
+    Take ``quantity`` off an item's stock in one conditional UPDATE.
+
+    The ``quantity >= n`` check and the decrement happen in the same
+    statement, so concurrent callers can never oversell. Returns True when
+    the stock was reserved.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        updated = SupplyItem.objects.filter(pk=supply_item_id, quantity__gte=quantity).update(
+            quantity=F('quantity') - quantity,
+            last_updated=now,
+            updated_at=now,
+        )
+        if updated:
+            record_movement(supply_item_id, -quantity, 'RESERVE', supply_request)
+            refresh_reorder_queue([supply_item_id])
+            invalidate_catalog_on_band_change({supply_item_id: -quantity})
+    return updated == 1
+
+
+def release_stock(supply_item_id, quantity, supply_request=None):
+    """Put ``quantity`` back on an item's stock without a read-modify-write."""
+    now = timezone.now()
+    with transaction.atomic():
+        SupplyItem.objects.filter(pk=supply_item_id).update(
+            quantity=F('quantity') + quantity,
+            last_updated=now,
+            updated_at=now,
+        )
+        record_movement(supply_item_id, quantity, 'RELEASE', supply_request)
+        refresh_reorder_queue([supply_item_id])
+        invalidate_catalog_on_band_change({supply_item_id: quantity})
+
+
+def submit_supply_request(supply_item, customer, quantity):
+    """
+    Reserve stock and record the customer's request atomically.
+
+    Raises InsufficientStock if the item no longer has ``quantity`` on hand;
+    the request row is rolled back with it.
+    """
+    with transaction.atomic():
+        supply_request = SupplyItemRequest.objects.create(
+            supply_item=supply_item,
+            customer=customer,
+            quantity=quantity,
+        )
+        if not reserve_stock(supply_item.pk, quantity, supply_request):
+            raise InsufficientStock(supply_item.pk)
+        return supply_request
+
+
+REVIEW_ACTIONS = {
+    # action: (request status, transaction status)
+    # Approval lands on PROCESSING, same as approve_request after the status sync signal
+    'approve': ('PROCESSING', 'PROCESSING'),
+    'reject': ('REJECTED', 'CANCELLED'),
+}
+
+
+def bulk_review_requests(request_ids, action):
+    """
+    Approve or reject many pending requests with a handful of set-based
+    statements instead of per-row saves and signals.
+
+    Returns a dict mapping each requested id to 'approved', 'rejected',
+    'not pending' or 'not found'.
+    """
+    request_status, transaction_status = REVIEW_ACTIONS[action]
+    request_ids = {int(pk) for pk in request_ids}
+
+    with transaction.atomic():
+        rows = list(
+            SupplyItemRequest.objects.select_for_update()
+            .filter(pk__in=request_ids)
+            .values_list('id', 'status', 'supply_item_id', 'quantity')
+        )
+        pending = [row for row in rows if row[1] == 'PENDING']
+        pending_ids = [row[0] for row in pending]
+
+        if pending_ids:
+            now = timezone.now()
+            SupplyItemRequest.objects.filter(pk__in=pending_ids).update(status=request_status)
+            request_transactions = SupplyItemTransaction.objects.filter(supply_request__in=pending_ids)
+            # Queryset updates skip the rollup signals
+            move_status(request_transactions, transaction_status)
+            request_transactions.update(status=transaction_status)
+
+            if action == 'reject':
+                # One UPDATE puts every rejected quantity back, summed per item
+                restock = defaultdict(int)
+                for _, _, supply_item_id, quantity in pending:
+                    restock[supply_item_id] += quantity
+                SupplyItem.objects.filter(pk__in=restock).update(
+                    quantity=F('quantity') + Case(
+                        *[When(pk=pk, then=Value(amount)) for pk, amount in restock.items()],
+                        output_field=PositiveIntegerField(),
+                    ),
+                    last_updated=now,
+                    updated_at=now,
+                )
+                StockMovement.objects.bulk_create([
+                    StockMovement(supply_item_id=supply_item_id, delta=quantity, reason='RELEASE', supply_request_id=pk)
+                    for pk, _, supply_item_id, quantity in pending
+                ])
+                refresh_reorder_queue(restock)
+                invalidate_catalog_on_band_change(restock)
+
+    done = 'approved' if action == 'approve' else 'rejected'
+    results = {pk: 'not found' for pk in request_ids}
+    results.update({row[0]: 'not pending' for row in rows})
+    results.update({pk: done for pk in pending_ids})
+    return results
+
+
+def add_supplier_items(supplier_profile, item_ids):
+    """
+    Link items to a supplier with one multi-row INSERT into the M2M table,
+    skipping links that already exist. Returns the number of links added.
+    """
+    through = SupplierProfile.supply_items.through
+    item_ids = set(item_ids)
+    with transaction.atomic():
+        existing = set(
+            through.objects.filter(supplierprofile=supplier_profile, supplyitem_id__in=item_ids)
+            .values_list('supplyitem_id', flat=True)
+        )
+        links = [
+            through(supplierprofile_id=supplier_profile.pk, supplyitem_id=item_id)
+            for item_id in sorted(item_ids - existing)
+        ]
+        through.objects.bulk_create(links, batch_size=500, ignore_conflicts=True)
+        # bulk_create skips m2m_changed, so invalidate the customer catalog here
+        transaction.on_commit(bump_catalog_version)
+    return len(links)
@@ -1,8 +1,15 @@
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db import connections, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
-from django.contrib.auth.models import Group
-from supply.models import CustomUser, SupplierProfile, SupplyItemRequest, SupplyItemTransaction
+from django.contrib.auth.models import Group, Permission
+from supply.models import CustomUser, SupplierProfile, SupplyItem, SupplyItemRequest, SupplyItemTransaction
+from supply.catalog import bump_catalog_version
+from supply.images import has_variants, schedule_variants
+from supply.permissions import bump_permissions_version, invalidate_user_permissions
+from supply.reorder import refresh_reorder_queue
+from supply.rollups import apply_changes, current_state, stored_state
+from supply.search import install_search_index, search_index_needs_repair
 
 @receiver(post_save, sender=CustomUser)
 def add_supplier_to_group(sender, instance, created, **kwargs):
@@ -40,8 +47,8 @@ def create_supplier_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=SupplyItemRequest)
 def handle_supply_request(sender, instance, created, **kwargs):
     if created:
-        # Create a new supply transaction
-        SupplyItemTransaction.objects.create(
+        # Create a new supply transaction and link the request to it
+        supply_transaction = SupplyItemTransaction.objects.create(
             supply_item=instance.supply_item,
             customer=instance.customer,
             quantity=instance.quantity,
@@ -49,22 +56,100 @@ def handle_supply_request(sender, instance, created, **kwargs):
             status='NEW',
             transaction_date=timezone.now()
         )
-        
-        # Update the available quantity
-        instance.supply_item.quantity -= instance.quantity
-        instance.supply_item.save()
+        instance.supply_transaction = supply_transaction
+        SupplyItemRequest.objects.filter(pk=instance.pk).update(supply_transaction=supply_transaction)
+        # Stock is reserved atomically by supply.services.submit_supply_request
         
 @receiver(post_save, sender=SupplyItemTransaction)
 def sync_request_status_with_transaction(sender, instance, **kwargs):
     allowed_status = ['PROCESSING', 'COMPLETED', 'REJECTED', 'FOR_DELIVERY', 'DELIVERED']
     if instance.status in allowed_status:
-        # Find all matching requests
-        requests = SupplyItemRequest.objects.filter(
-            supply_item=instance.supply_item,
-            customer=instance.customer,
-            quantity=instance.quantity,
-        )
-        for request in requests:
-            if request.status != instance.status:
-                request.status = instance.status
-                request.save()
+        # Keyed update of the request linked to this transaction
+        SupplyItemRequest.objects.filter(supply_transaction=instance).exclude(
+            status=instance.status
+        ).update(status=instance.status)
+
+@receiver(pre_save, sender=SupplyItemTransaction)
+def remember_rollup_state(sender, instance, raw, **kwargs):
+    # What the row counted towards before this save, so post_save can move it
+    instance._rollup_previous = None if raw or instance.pk is None else stored_state(instance.pk)
+
+@receiver(post_save, sender=SupplyItemTransaction)
+def update_daily_rollups(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    current = current_state(instance, previous)
+    if current != previous:
+        apply_changes([(previous, -1), (current, 1)])
+    instance._rollup_previous = current
+
+@receiver(post_delete, sender=SupplyItemTransaction)
+def remove_from_daily_rollups(sender, instance, **kwargs):
+    apply_changes([(getattr(instance, '_rollup_previous', None) or current_state(instance), -1)])
+
+@receiver(post_save, sender=SupplyItem)
+def update_reorder_queue(sender, instance, **kwargs):
+    # Covers creates and edits; stock-only UPDATEs refresh the queue in supply.services
+    refresh_reorder_queue([instance.pk])
+
+@receiver(post_save, sender=SupplyItem)
+def generate_supply_image_variants(sender, instance, **kwargs):
+    # Keep the flag pages read in step with storage: a new upload has no variants yet
+    ready = bool(instance.supply_image) and has_variants(instance.supply_image.name)
+    if ready != instance.image_variants:
+        SupplyItem.objects.filter(pk=instance.pk).update(image_variants=ready)
+        instance.image_variants = ready
+    # Resizing happens in the image process pool once the upload is committed
+    if instance.supply_image and not ready:
+        name = instance.supply_image.name
+        transaction.on_commit(lambda: schedule_variants(name))
+
+@receiver(post_save, sender=SupplyItem)
+@receiver(post_delete, sender=SupplyItem)
+@receiver(post_save, sender=SupplierProfile)
+@receiver(post_delete, sender=SupplierProfile)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Bump after commit so no reader can cache the pre-change catalog under the new version
+    transaction.on_commit(bump_catalog_version)
+
+@receiver(m2m_changed, sender=SupplierProfile.supply_items.through)
+def invalidate_catalog_cache_on_suppliers_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(bump_catalog_version)
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_permission_cache(sender, instance, **kwargs):
+    # is_active / is_superuser changes alter the effective permission set
+    transaction.on_commit(lambda: invalidate_user_permissions(instance.pk))
+
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def invalidate_permission_cache_on_membership_change(sender, instance, action, reverse, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # Changed from the group/permission side: any number of users affected
+        transaction.on_commit(bump_permissions_version)
+    else:
+        transaction.on_commit(lambda: invalidate_user_permissions(instance.pk))
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permission_cache_on_group_permissions_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(bump_permissions_version)
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_permission_cache_on_definition_change(sender, **kwargs):
+    transaction.on_commit(bump_permissions_version)
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    # SQLite table rebuilds in later migrations drop the FTS sync triggers
+    if sender.label == 'supply' and search_index_needs_repair(connections[using]):
+        with connections[using].schema_editor() as schema_editor:
+            install_search_index(schema_editor)
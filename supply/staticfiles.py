@@ -0,0 +1,119 @@
+import gzip
+import json
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip copies are always written
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.html', '.xml', '.ttf', '.otf', '.eot', '.ico',
+}
+# Files smaller than this gain nothing once headers are counted
+MIN_COMPRESS_SIZE = 256
+
+COMPRESSION_REPORT_NAME = 'compression-report.json'
+
+# name.<12 hex digits>.ext, as written by ManifestStaticFilesStorage
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest-hashed static files with .gz (and, if brotli is installed, .br)
+    copies of every compressible hashed file, written at collectstatic time.
+    """
+
+    def url_converter(self, name, hashed_files, template=None):
+        converter = super().url_converter(name, hashed_files, template)
+
+        def convert(matchobj):
+            try:
+                return converter(matchobj)
+            except ValueError:
+                # Vendored CSS/JS may point at files that are not shipped (mostly source maps)
+                return matchobj['matched']
+
+        return convert
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            self.write_compression_report(self.compress_files(set(self.hashed_files.values())))
+
+    def compress_files(self, names):
+        report = {'files': 0, 'original_bytes': 0, 'gzip_bytes': 0, 'brotli_bytes': 0}
+        for name in sorted(names):
+            if posixpath.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            with self.open(name) as original:
+                content = original.read()
+            if len(content) < MIN_COMPRESS_SIZE:
+                continue
+
+            report['files'] += 1
+            report['original_bytes'] += len(content)
+            report['gzip_bytes'] += self.write_compressed(name + '.gz', content, gzip.compress(content, 9, mtime=0))
+            if brotli is not None:
+                report['brotli_bytes'] += self.write_compressed(name + '.br', content, brotli.compress(content))
+        return report
+
+    def write_compressed(self, name, content, compressed):
+        """Store a compressed copy only when it is smaller; returns the bytes a client will receive."""
+        if len(compressed) >= len(content):
+            return len(content)
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as target:
+            target.write(compressed)
+        return len(compressed)
+
+    def write_compression_report(self, report):
+        with open(self.path(COMPRESSION_REPORT_NAME), 'w') as target:
+            json.dump({**report, 'brotli': brotli is not None}, target, indent=2)
+
+
+def serve_static(request, path):
+    """
+    Serve collected static files with their precompressed copies and
+    far-future immutable caching for hashed names. For deployments without
+    a front-end server; enable with SERVE_STATIC.
+    """
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        # A path that escapes STATIC_ROOT is simply not a static file
+        raise Http404(path)
+    if not os.path.isfile(fullpath):
+        raise Http404(path)
+
+    content_type = mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    accepted = request.headers.get('Accept-Encoding', '')
+    encoding = None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if name in accepted and os.path.isfile(fullpath + suffix):
+            encoding, fullpath = name, fullpath + suffix
+            break
+
+    response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if HASHED_NAME_RE.search(path):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=60'
+    return response
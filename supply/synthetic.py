@@ -0,0 +1,289 @@
+"""
+Synthetic data at production-like volumes, for benchmarks and load tests.
+
+Everything is written with bulk inserts (signals do not fire), so the rows
+each signal would have added are written here too: the REQUEST transaction
+behind every request, supplier profiles and group membership, the stock
+ledger and the reorder queue. Distributions are skewed the way real
+catalogs are: a few categories and items get most of the requests, a few
+customers place most of them, and stock is mostly healthy with a tail of
+low and out-of-stock items. Daily rollups are rebuilt for the whole
+history at the end. The same seed always produces the same data.
+"""
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.utils import timezone
+
+from supply.catalog import bump_catalog_version
+from supply.models import (
+    CustomerProfile,
+    CustomUser,
+    StockMovement,
+    SupplierProfile,
+    SupplyItem,
+    SupplyItemRequest,
+    SupplyItemTransaction,
+)
+from supply.reorder import rebuild_reorder_queue
+from supply.rollups import backfill_rollups
+
+SYNTHETIC_PASSWORD = 'synthetic'
+
+CATEGORIES = [
+    'Office', 'Cleaning', 'Medical', 'Electrical', 'Plumbing', 'Safety', 'Tools', 'Packaging',
+    'Kitchen', 'IT Hardware', 'Stationery', 'Fasteners', 'Lighting', 'Furniture', 'Lab',
+    'Paint', 'Outdoor', 'Automotive', 'Textiles', 'Signage',
+]
+NOUNS = [
+    'gloves', 'tape', 'paper', 'cable', 'battery', 'cleaner', 'mask', 'bolt', 'filter', 'marker',
+    'bulb', 'valve', 'box', 'towel', 'adapter', 'brush', 'label', 'sealant', 'hose', 'drill bit',
+]
+ADJECTIVES = [
+    'heavy-duty', 'disposable', 'industrial', 'compact', 'premium', 'reusable', 'standard',
+    'wide', 'insulated', 'waterproof',
+]
+UNITS = ['pc', 'box', 'pack', 'roll', 'set', 'kg', 'l']
+
+ITEM_STATUSES = (('ACTIVE', 90), ('INACTIVE', 7), ('DISCONTINUED', 3))
+
+# Request status by age: (max age in days, [(request status, transaction status, weight)])
+REQUEST_OUTCOMES = [
+    (2, [('PENDING', 'NEW', 80), ('PROCESSING', 'PROCESSING', 15), ('REJECTED', 'CANCELLED', 5)]),
+    (14, [('PENDING', 'NEW', 10), ('PROCESSING', 'PROCESSING', 40),
+          ('COMPLETED', 'COMPLETED', 40), ('REJECTED', 'CANCELLED', 10)]),
+    (None, [('COMPLETED', 'COMPLETED', 88), ('REJECTED', 'CANCELLED', 12)]),
+]
+
+
+def zipf_weights(count, exponent=1.1):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _timestamp(rng, now, days):
+    """A time in the last ``days`` days, weighted to weekdays and office hours."""
+    while True:
+        moment = now - timedelta(seconds=rng.random() * days * 86400)
+        if moment.weekday() >= 5 and rng.random() > 0.3:
+            continue
+        if not 8 <= moment.hour < 18 and rng.random() > 0.2:
+            continue
+        return moment
+
+
+def _outcome(rng, age_days):
+    for max_age, outcomes in REQUEST_OUTCOMES:
+        if max_age is None or age_days <= max_age:
+            return _weighted(rng, [(statuses[:2], statuses[2]) for statuses in outcomes])
+
+
+@contextmanager
+def _explicit_dates(model, field_name):
+    """Insert the dates set on the objects instead of stamping auto_now_add fields with now."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def _next_number(model, field, prefix):
+    return model.objects.filter(**{f'{field}__startswith': prefix}).count()
+
+
+def generate_dataset(
+    items=1000,
+    suppliers=20,
+    customers=200,
+    requests=5000,
+    deliveries=1000,
+    days=180,
+    seed=0,
+    batch_size=1000,
+    stdout=None,
+):
+    """
+    Add a synthetic catalog and its history to the database. Returns the
+    number of rows created per model. Can be run repeatedly; numbering
+    continues after earlier synthetic rows.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    counts = {}
+
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    with transaction.atomic():
+        # Items
+        first = _next_number(SupplyItem, 'item_id', 'SYN-')
+        category_weights = zipf_weights(len(CATEGORIES))
+        item_rows = []
+        for number in range(first, first + items):
+            reorder_level = rng.randint(5, 50)
+            band = rng.random()
+            if band < 0.06:
+                quantity = 0
+            elif band < 0.18:
+                quantity = rng.randint(1, reorder_level)
+            else:
+                quantity = reorder_level + int(rng.lognormvariate(4, 1))
+            item_rows.append(SupplyItem(
+                item_id=f'SYN-{number:07d}',
+                name=f'{rng.choice(ADJECTIVES).capitalize()} {rng.choice(NOUNS)} {number}',
+                description=f'Synthetic {rng.choice(ADJECTIVES)} item for load testing.',
+                category=rng.choices(CATEGORIES, category_weights)[0],
+                unit_of_measure=rng.choice(UNITS),
+                unit_cost=Decimal(f'{min(rng.lognormvariate(3, 1), 99999):.2f}'),
+                quantity=quantity,
+                reorder_level=reorder_level,
+                lead_time_days=rng.randint(2, 30),
+                status=_weighted(rng, ITEM_STATUSES),
+            ))
+        item_rows = SupplyItem.objects.bulk_create(item_rows, batch_size=batch_size)
+        counts['items'] = len(item_rows)
+        log(f"{len(item_rows)} items")
+
+        # Users; one password hash serves every synthetic account
+        password = make_password(SYNTHETIC_PASSWORD)
+        first_supplier = _next_number(CustomUser, 'username', 'synthetic-supplier-')
+        first_customer = _next_number(CustomUser, 'username', 'synthetic-customer-')
+        supplier_users = CustomUser.objects.bulk_create([
+            CustomUser(username=f'synthetic-supplier-{number:05d}', password=password, user_type='supplier')
+            for number in range(first_supplier, first_supplier + suppliers)
+        ], batch_size=batch_size)
+        customer_users = CustomUser.objects.bulk_create([
+            CustomUser(username=f'synthetic-customer-{number:06d}', password=password, user_type='customer')
+            for number in range(first_customer, first_customer + customers)
+        ], batch_size=batch_size)
+
+        supplier_group, _ = Group.objects.get_or_create(name='Supplier')
+        CustomUser.groups.through.objects.bulk_create([
+            CustomUser.groups.through(customuser_id=user.pk, group_id=supplier_group.pk)
+            for user in supplier_users
+        ], batch_size=batch_size)
+        supplier_profiles = SupplierProfile.objects.bulk_create([
+            SupplierProfile(
+                user=user,
+                company_name=f'Synthetic Supply Co. {user.username.rsplit("-", 1)[1]}',
+                email=f'{user.username}@example.com',
+                approved=rng.random() < 0.9,
+            )
+            for user in supplier_users
+        ], batch_size=batch_size)
+        counts['suppliers'] = len(supplier_profiles)
+
+        # Each supplier carries a lognormal share of the catalog
+        links = set()
+        for profile in supplier_profiles:
+            carried = min(len(item_rows), int(rng.lognormvariate(3, 1)) + 1)
+            for item in rng.sample(item_rows, carried):
+                links.add((profile.pk, item.pk))
+        SupplierProfile.supply_items.through.objects.bulk_create([
+            SupplierProfile.supply_items.through(supplierprofile_id=profile_id, supplyitem_id=item_id)
+            for profile_id, item_id in sorted(links)
+        ], batch_size=batch_size)
+        counts['supplier_items'] = len(links)
+
+        customer_profiles = CustomerProfile.objects.bulk_create([
+            CustomerProfile(user=user, address=f'{rng.randint(1, 999)} Synthetic Street')
+            for user in customer_users
+        ], batch_size=batch_size)
+        counts['customers'] = len(customer_profiles)
+        log(f"{len(supplier_profiles)} suppliers, {len(customer_profiles)} customers")
+
+        # Requests and their REQUEST transactions, popular items and busy customers first
+        requestable = [item for item in item_rows if item.status == 'ACTIVE'] or item_rows
+        rng.shuffle(requestable)
+        item_weights = zipf_weights(len(requestable))
+        customer_weights = zipf_weights(len(customer_profiles), 0.8)
+        request_rows = []
+        for _ in range(requests if customer_profiles else 0):
+            requested_at = _timestamp(rng, now, days)
+            request_status, transaction_status = _outcome(rng, (now - requested_at).days)
+            supply_transaction = SupplyItemTransaction(
+                supply_item=rng.choices(requestable, item_weights)[0],
+                customer=rng.choices(customer_profiles, customer_weights)[0],
+                quantity=1 + int(rng.expovariate(0.3)),
+                transaction_type='REQUEST',
+                status=transaction_status,
+                transaction_date=requested_at,
+            )
+            request_rows.append(SupplyItemRequest(
+                supply_item=supply_transaction.supply_item,
+                customer=supply_transaction.customer,
+                quantity=supply_transaction.quantity,
+                status=request_status,
+                request_date=requested_at,
+                supply_transaction=supply_transaction,
+            ))
+        # Ids grow with time, as they would in production
+        request_rows.sort(key=lambda row: row.request_date)
+
+        with _explicit_dates(SupplyItemTransaction, 'transaction_date'):
+            request_transactions = SupplyItemTransaction.objects.bulk_create(
+                [row.supply_transaction for row in request_rows], batch_size=batch_size,
+            )
+        with _explicit_dates(SupplyItemRequest, 'request_date'):
+            request_rows = SupplyItemRequest.objects.bulk_create(request_rows, batch_size=batch_size)
+        counts['requests'] = len(request_rows)
+        log(f"{len(request_rows)} requests")
+
+        # Supplier deliveries, spread over the same window
+        with _explicit_dates(SupplyItemTransaction, 'transaction_date'):
+            delivery_rows = SupplyItemTransaction.objects.bulk_create(sorted((
+                SupplyItemTransaction(
+                    supply_item=rng.choices(requestable, item_weights)[0],
+                    quantity=rng.choice((10, 20, 25, 50, 100, 200)),
+                    transaction_type='DELIVERY',
+                    status=_weighted(rng, (('DELIVERED', 85), ('FOR_DELIVERY', 10), ('CANCELLED', 5))),
+                    transaction_date=_timestamp(rng, now, days),
+                )
+                for _ in range(deliveries)
+            ), key=lambda row: row.transaction_date), batch_size=batch_size)
+        counts['transactions'] = len(request_transactions) + len(delivery_rows)
+
+        # Stock ledger: an opening balance, then a RESERVE per request and a
+        # RELEASE per rejection, so each item's deltas sum to its quantity
+        reserved = {}
+        movements = []
+        for row in request_rows:
+            movements.append(StockMovement(
+                supply_item_id=row.supply_item_id, delta=-row.quantity, reason='RESERVE',
+                supply_request=row, created_at=row.request_date,
+            ))
+            if row.status == 'REJECTED':
+                movements.append(StockMovement(
+                    supply_item_id=row.supply_item_id, delta=row.quantity, reason='RELEASE',
+                    supply_request=row, created_at=row.request_date + timedelta(hours=rng.randint(1, 48)),
+                ))
+            else:
+                reserved[row.supply_item_id] = reserved.get(row.supply_item_id, 0) + row.quantity
+        opening_at = now - timedelta(days=days + 1)
+        movements = [
+            StockMovement(
+                supply_item_id=item.pk, delta=item.quantity + reserved.get(item.pk, 0),
+                reason='OPENING', created_at=opening_at,
+            )
+            for item in item_rows
+        ] + sorted(movements, key=lambda movement: movement.created_at)
+        with _explicit_dates(StockMovement, 'created_at'):
+            movements = StockMovement.objects.bulk_create(movements, batch_size=batch_size)
+        counts['stock_movements'] = len(movements)
+
+        counts['reorder_queue'] = rebuild_reorder_queue()
+        counts['daily_rollups'] = backfill_rollups()
+        transaction.on_commit(bump_catalog_version)
+    return counts
@@ -1,7 +1,41 @@
 from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from supply import images
+from supply.facets import FACET_LABELS
 
 register = template.Library()
 
 @register.filter
 def get_item(dictionary, key):
-    return dictionary.get(key)
\ No newline at end of file
+    return dictionary.get(key)
+
+@register.filter
+def facet_label(facet):
+    return FACET_LABELS.get(facet, facet)
+
+@register.filter
+def srcset(image, fmt='webp'):
+    """srcset of the resized variants of a supply_image (field file or storage name), once they exist."""
+    return images.srcset(getattr(image, 'name', image), fmt)
+
+@register.simple_tag
+def supply_picture(image, ready=False, alt='', sizes='160px', css_class=''):
+    """
+    A <picture> serving the WebP variants with JPEG fallback, or the original
+    upload until its variants have been generated. ``ready`` is the item's
+    image_variants flag, so rendering never has to ask storage.
+    """
+    name = getattr(image, 'name', image)
+    if not name:
+        return ''
+    if not ready:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', default_storage.url(name), alt, css_class)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" loading="lazy"></picture>',
+        images.srcset(name, 'webp'), sizes,
+        default_storage.url(images.variant_name(name, images.VARIANT_WIDTHS[0], 'jpeg')),
+        images.srcset(name, 'jpeg'), sizes, alt, css_class,
+    )
@@ -0,0 +1,116 @@
+import re
+import unittest
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from supply.catalog import requestable_paginator
+from supply.models import CustomUser, SupplyItem, SupplyItemRequest, SupplyItemTransaction
+from supply.pagination import KeysetPaginator
+
+# A private locmem cache, so the tests never touch a configured shared cache
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'supply-tests',
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES, PERMISSION_CACHE_TIMEOUT=3600)
+class CachedPermissionBackendTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user('manager', password='pw', user_type='supply_manager')
+        self.view = Permission.objects.get(codename='view_supplyitem')
+        self.add = Permission.objects.get(codename='add_supplyitem')
+        self.user.user_permissions.add(self.view)
+        self.group = Group.objects.create(name='Editors')
+        self.group.permissions.add(self.add)
+        self.user.groups.add(self.group)
+
+    def fresh_user(self):
+        # A new instance, as the next request would load
+        return CustomUser.objects.get(pk=self.user.pk)
+
+    def test_warm_permission_check_runs_no_queries(self):
+        user = self.fresh_user()
+        with self.assertNumQueries(2):
+            self.assertTrue(user.has_perm('supply.view_supplyitem'))
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm('supply.view_supplyitem'))
+            self.assertTrue(user.has_perm('supply.add_supplyitem'))
+
+    def test_revoking_a_user_permission_takes_effect_on_the_next_request(self):
+        self.assertTrue(self.fresh_user().has_perm('supply.view_supplyitem'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.remove(self.view)
+        self.assertFalse(self.fresh_user().has_perm('supply.view_supplyitem'))
+
+    def test_revoking_a_group_permission_takes_effect_on_the_next_request(self):
+        self.assertTrue(self.fresh_user().has_perm('supply.add_supplyitem'))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.remove(self.add)
+        self.assertFalse(self.fresh_user().has_perm('supply.add_supplyitem'))
+
+    @override_settings(PERMISSION_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_the_cross_request_cache(self):
+        self.fresh_user().has_perm('supply.view_supplyitem')
+        user = self.fresh_user()
+        with self.assertNumQueries(2):
+            self.assertTrue(user.has_perm('supply.view_supplyitem'))
+
+
+# Plan lines that mean a table is read end to end, or sorted after reading
+FULL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (?!.*\bUSING\b)(\w+)'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+SORT_STEP = {
+    'sqlite': re.compile(r'USE TEMP B-TREE FOR ORDER BY'),
+    'postgresql': re.compile(r'\bSort\b'),
+}
+
+
+def hot_querysets():
+    """The querysets behind the busiest pages, keyed by a readable label."""
+    catalog = KeysetPaginator(SupplyItem.objects.all(), ['name', 'id'], 25)
+    requestable = requestable_paginator()
+    history = KeysetPaginator(SupplyItemTransaction.objects.all(), ['-transaction_date', '-id'], 10)
+    return {
+        'pending request queue': SupplyItemRequest.objects.filter(status='PENDING').order_by('-request_date'),
+        'requests by status': SupplyItemRequest.objects.filter(status='APPROVED').order_by('-request_date'),
+        'customer request history': SupplyItemRequest.objects.filter(customer_id=1).order_by('-request_date'),
+        'transaction by request link': SupplyItemTransaction.objects.filter(supply_request__id=1),
+        'customer catalog page': requestable.queryset.filter(
+            requestable._seek(['m', 1], backwards=False)
+        ).order_by('name', 'id')[:26],
+        'catalog keyset page': catalog.queryset.filter(
+            catalog._seek(['m', 1], backwards=False)
+        ).order_by('name', 'id')[:26],
+        'transaction history keyset page': history.queryset.filter(
+            history._seek([history.fields[0][0].to_python('2024-01-01T00:00:00+00:00'), 1], backwards=False)
+        ).order_by('-transaction_date', '-id')[:11],
+    }
+
+
+@unittest.skipUnless(connection.vendor in FULL_SCAN, "Query plans are only read on SQLite and PostgreSQL.")
+class QueryPlanTests(TestCase):
+    """The hot request, transaction and catalog queries are served by an index, in index order."""
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            # Empty tables make a seq scan look cheaper; ask whether an index *can* be used
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def test_hot_queries_use_an_index(self):
+        for label, queryset in hot_querysets().items():
+            with self.subTest(label):
+                plan = queryset.explain()
+                self.assertIsNone(FULL_SCAN[connection.vendor].search(plan), plan)
+                self.assertIsNone(SORT_STEP[connection.vendor].search(plan), plan)
@@ -7,7 +7,8 @@ from supply.views import (
     SupplyItemTransactionListView,      
     SupplyManagerProfileDetailView,
     update_supply_manager_profile,
-    CustomerSupplyRequestListView
+    CustomerSupplyRequestListView,
+    ReorderQueueListView,
 
 )
 
@@ -20,6 +21,7 @@ urlpatterns = [
 
     # SupplyItem URLs
     path('supplyitem/create/', views.create_supply_item, name='create_supply_item'),
+    path('supplyitem/import/', views.import_supply_items_view, name='import_supply_items'),
     path('supplyitem/lists', SupplyItemListView.as_view(), name='supplyitem_list'),
     path('supplyitem/<int:pk>/', views.SupplyItemDetailView.as_view(), name='supplyitem_detail'),
     path('supplyitem/<int:pk>/transaction/recieved/', views.supplyitem_transaction_receive, name='supplyitem_transaction_receive'),
@@ -31,6 +33,7 @@ urlpatterns = [
     path('supplier/register/', views.supplier_registration, name='supplier_registration'),
     path('supplier/profile/<pk>/', SupplierProfileDetailView.as_view(), name='supplier_profile_detail'),
     path('supplier/choose-items/', views.supplier_choose_items, name='supplier_choose_items'),
+    path('supplier/choose-items/picker/', views.supplier_item_picker, name='supplier_item_picker'),
     path('supplier/remove-items/', views.supplier_remove_items, name='supplier_remove_items'),
     
     # SupplyManager URLs
@@ -42,11 +45,15 @@ urlpatterns = [
     path('supplymanager/supply-requests/pending/', 
         CustomerPendingRequestListView.as_view(),
         name='customer_pending_requests'),
+    path('supplymanager/reorder-queue/', ReorderQueueListView.as_view(), name='reorder_queue'),
+    path('supplymanager/dashboard/', views.dashboard, name='dashboard'),
     path('supply-request/<int:pk>/approve/', views.approve_request, name='approve_request'),
     path('supply-request/<int:pk>/reject/', views.reject_request, name='reject_request'),
+    path('supply-request/bulk-review/', views.bulk_review_requests_view, name='bulk_review_requests'),
 
     # Supply Item Transaction History
     path('supplyitem/transactions', SupplyItemTransactionListView.as_view(), name='supplyitem_transaction'),
+    path('supplyitem/transactions/export/', views.export_transactions, name='export_transactions'),
     
     # Customer URLS
     path('customer/login/', views.customer_login, name='customer_login'),
@@ -58,4 +65,10 @@ urlpatterns = [
         name='customer_supply_request_list'),
     
     path('transaction/<int:pk>/complete/', views.complete_transaction, name='complete_transaction'),
+
+    # Async read views, for deployments served through sms/asgi.py
+    path('async/requestable-supply/', views.async_customer_requestable_supply, name='async_customer_requestable_supply'),
+    path('async/customer/supply-requests/', views.async_customer_supply_requests, name='async_customer_supply_request_list'),
+    path('async/supplymanager/supply-requests/pending/', views.async_customer_pending_requests, name='async_customer_pending_requests'),
+    path('async/supplyitem/<int:pk>/', views.async_supplyitem_detail, name='async_supplyitem_detail'),
 ]
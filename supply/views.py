@@ -1,4 +1,6 @@
+import io
 from datetime import datetime
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib import messages
@@ -9,14 +11,20 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.decorators import permission_required
 
 from django.views.generic import ListView, DetailView, UpdateView
+from django.views.decorators.http import require_POST
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.db import IntegrityError, transaction
 
 from supply.forms import (
     SupplyItemForm,
+    SupplyItemUploadForm,
     SupplierProfileForm,
     SupplierSupplyItemsForm,
     SupplierLoginForm,
     SupplyItemTransactionForm,
+    TransactionExportFilterForm,
     UserProfileForm,
     SupplyManagerProfileForm,
     SupplyManagerLoginForm,
@@ -24,12 +32,35 @@ from supply.forms import (
     CustomerLoginForm
 )
 from supply.models import (
+    DailyCategoryRollup,
+    ReorderQueueEntry,
     SupplyItem, 
     SupplierProfile, 
     SupplyManagerProfile, 
     SupplyItemRequest, 
     SupplyItemTransaction,
     )
+from supply.catalog import (
+    CUSTOMER_FACETS,
+    aget_requestable_catalog,
+    aget_requestable_facets,
+    get_requestable_catalog,
+    get_requestable_facets,
+    get_supply_item_facets,
+)
+from supply.exporters import transaction_csv_lines
+from supply.facets import apply_facets, selected_facets
+from supply.importers import ImportReport, detect_format, import_supply_items
+from supply.pagination import InvalidCursor, KeysetPaginationMixin, KeysetPaginator
+from supply.rollups import TREND_DAYS, trends
+from supply.search import search_supply_items
+from supply.services import (
+    InsufficientStock,
+    add_supplier_items,
+    bulk_review_requests,
+    release_stock,
+    submit_supply_request,
+)
 
 #region Permissions
 
@@ -42,25 +73,49 @@ def is_supplier(user):
 def is_customer(user):
     return user.is_authenticated and user.user_type == 'customer'
 
+# Where each role lands when it is denied a page
+ROLE_HOME_URLS = {
+    'supplier': 'supply:supplier_choose_items',
+    'customer': 'supply:customer_requestable_supply',
+    'supply_manager': 'supply:supplyitem_list',
+}
+
 def handle_permission_denied(request):
     messages.error(request, "You don't have permission to access this page.")
     if request.user.is_authenticated:
-        if request.user.user_type == 'supplier':
-            return redirect('supplier_choose_items')
-        elif request.user.user_type == 'customer':
-            return redirect('customer_requestable_supply')
-        elif request.user.user_type == 'supply_manager':
-            return redirect('supplyitem_list')
-    return redirect('access_denied')
+        home_url = ROLE_HOME_URLS.get(request.user.user_type)
+        if home_url and request.resolver_match.view_name != home_url:
+            return redirect(home_url)
+    return redirect('supply:access_denied')
 
 #endregion Permissions
 
 #region HomePage, DashBoard, Logout
+@login_required
+@user_passes_test(is_supply_manager)
+@permission_required('supply.view_supplyitemtransaction', raise_exception=True)
 def dashboard(request):
     """
-    Render the dashboard views
+    Render the dashboard views: 90-day transaction trends read from the daily rollups
     """
-    return render(request, 'supply/supplyitem_create.html')
+    category = request.GET.get('category') or None
+    trend = trends(TREND_DAYS, category=category)
+    chart = {
+        'labels': [day.isoformat() for day in trend['days']],
+        'datasets': [
+            {'label': transaction_type, 'data': points['quantity']}
+            for transaction_type, points in trend['series'].items()
+        ],
+    }
+    context = {
+        'days': TREND_DAYS,
+        'category': category,
+        'categories': DailyCategoryRollup.objects.values_list('category', flat=True).distinct().order_by('category'),
+        'chart': chart,
+        'by_status': trend['by_status'],
+        'by_category': trend['by_category'],
+    }
+    return render(request, 'supply_manager/dashboard.html', context)
 
 def home_page(request):
     return render(request, 'home/index.html')
@@ -91,13 +146,42 @@ def create_supply_item(request):
         form = SupplyItemForm()
     return render(request, 'supply/supplyitem_create.html', {'form': form})
 
+@user_passes_test(is_supply_manager)
+@permission_required('supply.add_supplyitem', raise_exception=True)
+def import_supply_items_view(request):
+    """Upload a supplier catalog and upsert it in chunks"""
+    report = None
+    if request.method == 'POST':
+        form = SupplyItemUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            fmt = form.cleaned_data['format'] or detect_format(upload.name)
+            report = ImportReport(max_errors=100)
+            # Large uploads are spooled to a temp file; decode them as a stream
+            stream = io.TextIOWrapper(upload.open('rb'), encoding='utf-8-sig', newline='')
+            try:
+                import_supply_items(stream, fmt, report=report)
+            except (UnicodeDecodeError, ValueError) as e:
+                messages.error(request, f"Import stopped after {report.processed} rows: {e}")
+            except IntegrityError:
+                # A concurrent import created one of this chunk's items first; its chunk was rolled back
+                messages.error(
+                    request,
+                    f"Import stopped after {report.processed} rows: another import added the same "
+                    "items at the same time. Upload the file again to update them.",
+                )
+    else:
+        form = SupplyItemUploadForm()
+    return render(request, 'supply/supplyitem_import.html', {'form': form, 'report': report})
 
 # For Supply Items
-class SupplyItemListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, ListView):
+class SupplyItemListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     permission_required = 'supply.view_supplyitem'
     model = SupplyItem
     template_name = 'supply/supplyitem_list.html'
     context_object_name = 'supply_items'
+    paginate_by = 25
+    keyset_ordering = ['name', 'id']
 
     def test_func(self):
         return self.request.user.user_type == 'supply_manager'
@@ -105,9 +189,29 @@ class SupplyItemListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequ
     def handle_no_permission(self):
         return handle_permission_denied(self.request)
 
+    def get_search_query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.get_search_query():
+            queryset = search_supply_items(queryset, self.get_search_query())
+        # Facet counts describe the search results before the facet filters
+        self.selected_facets = selected_facets(self.request.GET)
+        return apply_facets(queryset, self.selected_facets)
+
+    def get_keyset_ordering(self):
+        # Best matches first while searching
+        if self.get_search_query():
+            return ['search_rank', 'id']
+        return self.keyset_ordering
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['forms'] = {item.id: SupplyItemForm(instance=item) for item in self.get_queryset()}
+        context['search_query'] = self.get_search_query()
+        context['facets'] = get_supply_item_facets(self.get_search_query(), self.selected_facets)
+        # Only build edit forms for the rows on this page
+        context['forms'] = {item.id: SupplyItemForm(instance=item) for item in context['supply_items']}
         return context
 
 class SupplyItemDetailView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, DetailView):
@@ -122,6 +226,38 @@ class SupplyItemDetailView(LoginRequiredMixin, UserPassesTestMixin, PermissionRe
     def handle_no_permission(self):
         return handle_permission_denied(self.request)
 
+class ReorderQueueListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
+    permission_required = 'supply.view_supplyitem'
+    model = ReorderQueueEntry
+    template_name = 'supply_manager/reorder_queue.html'
+    context_object_name = 'reorder_entries'
+    paginate_by = 25
+    sort_orderings = {
+        'shortfall': ['-shortfall', 'supply_item_id'],
+        'oldest': ['queued_at', 'supply_item_id'],
+    }
+
+    def test_func(self):
+        return self.request.user.user_type == 'supply_manager'
+
+    def handle_no_permission(self):
+        return handle_permission_denied(self.request)
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort')
+        return sort if sort in self.sort_orderings else 'shortfall'
+
+    def get_keyset_ordering(self):
+        return self.sort_orderings[self.get_sort()]
+
+    def get_queryset(self):
+        return ReorderQueueEntry.objects.select_related('supply_item')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['sort'] = self.get_sort()
+        return context
+
 @user_passes_test(is_supply_manager)
 def edit_supply_item(request, pk):
     item = get_object_or_404(SupplyItem, pk=pk)
@@ -138,6 +274,10 @@ def edit_supply_item(request, pk):
 #endregion SupplyItem Views   
 
 #region Supplier Views
+
+# Items per page of the supplier item picker's JSON endpoint
+ITEM_PICKER_PAGE_SIZE = 25
+
 #@permission_required('supply.add_supplierprofile', raise_exception=True)
 def supplier_registration(request):
     if request.method == 'POST':
@@ -213,33 +353,57 @@ class SupplierProfileDetailView(LoginRequiredMixin, UserPassesTestMixin, Permiss
 def supplier_choose_items(request):
     supplier_profile = get_object_or_404(SupplierProfile, user=request.user)
 
-    # Get IDs of already selected items
-    selected_items = supplier_profile.supply_items.values_list('id', flat=True)
-
     if request.method == 'POST':
-        form = SupplierSupplyItemsForm(request.POST, instance=supplier_profile)
-        # Show only items not already selected
-        form.fields['supply_items'].queryset = SupplyItem.objects.exclude(id__in=selected_items)
+        form = SupplierSupplyItemsForm(request.POST)
 
         if form.is_valid():
-            # Get new items selected from the form
-            new_items = form.cleaned_data['supply_items']
-
-            # Add them to the existing set instead of replacing
-            supplier_profile.supply_items.add(*new_items)
+            # Add the picked items to the existing set in one bulk insert
+            item_ids = form.cleaned_data['supply_items'].values_list('id', flat=True)
+            added = add_supplier_items(supplier_profile, item_ids)
+            messages.success(request, f"Added {added} supply items.")
 
             return redirect('supply:supplier_profile_detail', pk=supplier_profile.pk)
     else:
-        form = SupplierSupplyItemsForm(instance=supplier_profile)
-        # Show only items not already selected
-        form.fields['supply_items'].queryset = SupplyItem.objects.exclude(id__in=selected_items)
+        form = SupplierSupplyItemsForm()
 
+    # Items are loaded page by page from supplier_item_picker
     return render(
         request,
         'supplier/supplier_choose_items.html',
         {'form': form, 'supplier': supplier_profile}
     )
-    
+
+@login_required
+@user_passes_test(is_supplier)
+def supplier_item_picker(request):
+    """JSON pages of the items this supplier does not supply yet, for the item picker."""
+    supplier_profile = get_object_or_404(SupplierProfile, user=request.user)
+    search_query = request.GET.get('q', '').strip()
+
+    queryset = SupplyItem.objects.exclude(
+        id__in=SupplierProfile.supply_items.through.objects.filter(
+            supplierprofile=supplier_profile
+        ).values('supplyitem_id')
+    ).only('id', 'item_id', 'name', 'category')
+    ordering = ['name', 'id']
+    if search_query:
+        queryset = search_supply_items(queryset, search_query)
+        ordering = ['search_rank', 'id']
+
+    paginator = KeysetPaginator(queryset, ordering, ITEM_PICKER_PAGE_SIZE)
+    try:
+        page = paginator.page(after=request.GET.get('after'))
+    except InvalidCursor:
+        return JsonResponse({'error': "Invalid page cursor."}, status=400)
+
+    return JsonResponse({
+        'results': [
+            {'id': item.id, 'item_id': item.item_id, 'name': item.name, 'category': item.category}
+            for item in page
+        ],
+        'next_cursor': page.next_cursor,
+    })
+
 @permission_required('supply.change_supplierprofile', raise_exception=True)
 def supplier_remove_items(request):
     supplier_profile = get_object_or_404(SupplierProfile, user=request.user)
@@ -272,13 +436,13 @@ def supplyitem_transaction_deliver(request, pk):
     if request.method == 'POST':
         form = SupplyItemTransactionForm(request.POST)
         if form.is_valid():
-            transaction = form.save(commit=False)
-            transaction.supply_item = supply_item
-            transaction.transaction_type = 'issue'
-            transaction.transaction_date = datetime.now()
-            transaction.initiated_by = request.user  # uses `related_name='initiated_transactions'`
+            supply_transaction = form.save(commit=False)
+            supply_transaction.supply_item = supply_item
+            supply_transaction.transaction_type = 'issue'
+            supply_transaction.transaction_date = datetime.now()
+            supply_transaction.initiated_by = request.user  # uses `related_name='initiated_transactions'`
             # The quantity is already set by the form, and the model's save() method handles the update
-            transaction.save()
+            supply_transaction.save()
 
             return redirect('supply:supplyitem_detail', pk=supply_item.pk)
     else:
@@ -296,13 +460,13 @@ def supplyitem_transaction_receive(request, pk):
     if request.method == 'POST':
         form = SupplyItemTransactionForm(request.POST)
         if form.is_valid():
-            transaction = form.save(commit=False)
-            transaction.supply_item = supply_item
-            transaction.transaction_type = 'received'
-            transaction.transaction_date = datetime.now()
-            transaction.initiated_by = request.user  # uses `related_name='initiated_transactions'`
+            supply_transaction = form.save(commit=False)
+            supply_transaction.supply_item = supply_item
+            supply_transaction.transaction_type = 'received'
+            supply_transaction.transaction_date = datetime.now()
+            supply_transaction.initiated_by = request.user  # uses `related_name='initiated_transactions'`
             # The quantity is already set by the form, so we just need to save
-            transaction.save()
+            supply_transaction.save()
 
             return redirect('supply:supplyitem_detail', pk=supply_item.pk)
     else:
@@ -313,23 +477,48 @@ def supplyitem_transaction_receive(request, pk):
         'supply_item': supply_item
     })
     
-class SupplyItemTransactionListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, ListView):
+class SupplyItemTransactionListView(LoginRequiredMixin, UserPassesTestMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView):
     permission_required = 'supply.view_supplyitemtransaction'
     model = SupplyItemTransaction
     template_name = 'supply/supplyitem_transaction.html'
     context_object_name = 'transactions'
     paginate_by = 10 #Add this line to limit to 5 items per page
+    keyset_ordering = ['-transaction_date', '-id']
+
     def test_func(self):
         return self.request.user.user_type == 'supply_manager'
 
     def handle_no_permission(self):
         return handle_permission_denied(self.request)
 
+    def get_queryset(self):
+        return SupplyItemTransaction.objects.select_related('supply_item', 'customer__user')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['forms'] = {item.id: SupplyItemTransactionForm(instance=item) for item in self.get_queryset()}
+        context['export_form'] = TransactionExportFilterForm()
+        # Only build forms for the transactions on this page
+        context['forms'] = {item.id: SupplyItemTransactionForm(instance=item) for item in context['page_obj']}
         return context
 
+@login_required
+@user_passes_test(is_supply_manager)
+@permission_required('supply.view_supplyitemtransaction', raise_exception=True)
+def export_transactions(request):
+    """Stream the (filtered) transaction history as CSV"""
+    form = TransactionExportFilterForm(request.GET)
+    if not form.is_valid():
+        messages.error(request, "Invalid export filters.")
+        return redirect('supply:supplyitem_transaction')
+
+    response = StreamingHttpResponse(
+        transaction_csv_lines(**form.cleaned_data),
+        content_type='text/csv',
+    )
+    filename = f"transactions-{timezone.now():%Y%m%d-%H%M%S}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 #endregion SupplyItemTransaction Views
 
 #region Supply Manager Views
@@ -451,19 +640,19 @@ def approve_request(request, pk):
         return redirect('supply:customer_pending_requests')
     
     try:
-        # Update the request status
-        supply_request.status = 'APPROVED'
-        supply_request.save()
-        
-        # Update or create the corresponding transaction
-        transaction = SupplyItemTransaction.objects.get(
-            supply_item=supply_request.supply_item,
-            customer=supply_request.customer,
-            transaction_type='REQUEST'
-        )
-        transaction.status = 'PROCESSING'
-        transaction.save()
-        
+        with transaction.atomic():
+            # Conditional UPDATE, so of two concurrent reviews only the first finds the request pending
+            if not SupplyItemRequest.objects.filter(pk=pk, status='PENDING').update(status='APPROVED'):
+                messages.error(request, "This request cannot be approved because it's not in pending status.")
+                return redirect('supply:customer_pending_requests')
+            supply_request.status = 'APPROVED'
+
+            # Update the corresponding transaction; requests from before the link existed may have none
+            supply_transaction = supply_request.supply_transaction
+            if supply_transaction is not None:
+                supply_transaction.status = 'PROCESSING'
+                supply_transaction.save()
+
         messages.success(request, f"Request for {supply_request.supply_item.name} has been approved.")
     except Exception as e:
         messages.error(request, f"Error processing approval: {str(e)}")
@@ -481,45 +670,68 @@ def reject_request(request, pk):
         return redirect('supply:customer_pending_requests')
     
     try:
-        # Update the request status
-        supply_request.status = 'REJECTED'
-        supply_request.save()
-        
-        # Update the corresponding transaction
-        transaction = SupplyItemTransaction.objects.get(
-            supply_item=supply_request.supply_item,
-            customer=supply_request.customer,
-            transaction_type='REQUEST'
-        )
-        transaction.status = 'CANCELLED'
-        transaction.save()
-        
-        # Return the quantity back to supply item
-        supply_item = supply_request.supply_item
-        supply_item.quantity += supply_request.quantity
-        supply_item.save()
-        
+        with transaction.atomic():
+            # Conditional UPDATE, so of two concurrent reviews only the first finds the request pending
+            if not SupplyItemRequest.objects.filter(pk=pk, status='PENDING').update(status='REJECTED'):
+                messages.error(request, "This request cannot be rejected because it's not in pending status.")
+                return redirect('supply:customer_pending_requests')
+            supply_request.status = 'REJECTED'
+
+            # Update the corresponding transaction; requests from before the link existed may have none
+            supply_transaction = supply_request.supply_transaction
+            if supply_transaction is not None:
+                supply_transaction.status = 'CANCELLED'
+                supply_transaction.save()
+
+            # Return the quantity back to supply item
+            release_stock(supply_request.supply_item_id, supply_request.quantity, supply_request)
+
         messages.success(request, f"Request for {supply_request.supply_item.name} has been rejected.")
     except Exception as e:
         messages.error(request, f"Error processing rejection: {str(e)}")
     
     return redirect('supply:customer_pending_requests')
 
+@login_required
+@user_passes_test(is_supply_manager)
+@require_POST
+def bulk_review_requests_view(request):
+    """Approve or reject the selected pending requests in one go"""
+    action = request.POST.get('action')
+    request_ids = [pk for pk in request.POST.getlist('request_ids') if pk.isdigit()]
+
+    if action not in ('approve', 'reject') or not request_ids:
+        messages.error(request, "Select at least one request and an action.")
+        return redirect('supply:customer_pending_requests')
+
+    results = bulk_review_requests(request_ids, action)
+
+    if request.headers.get('Accept') == 'application/json':
+        return JsonResponse({'results': {str(pk): result for pk, result in results.items()}})
+
+    done = [pk for pk, result in results.items() if result in ('approved', 'rejected')]
+    skipped = sorted(pk for pk, result in results.items() if result not in ('approved', 'rejected'))
+    if done:
+        messages.success(request, f"{len(done)} request(s) {'approved' if action == 'approve' else 'rejected'}.")
+    if skipped:
+        messages.error(request, "Skipped requests that are no longer pending: " + ", ".join(f"#{pk} ({results[pk]})" for pk in skipped))
+    return redirect('supply:customer_pending_requests')
+
 @login_required
 @user_passes_test(is_supply_manager)
 def complete_transaction(request, pk):
     """Mark a transaction as completed after delivery"""
-    transaction = get_object_or_404(SupplyItemTransaction, pk=pk)
+    supply_transaction = get_object_or_404(SupplyItemTransaction, pk=pk)
     
-    if transaction.status != 'PROCESSING':
+    if supply_transaction.status != 'PROCESSING':
         messages.error(request, "This transaction cannot be completed because it's not in processing status.")
         return redirect('transaction_list')
     
     try:
-        transaction.status = 'COMPLETED'
-        transaction.save()
+        supply_transaction.status = 'COMPLETED'
+        supply_transaction.save()
         
-        messages.success(request, f"Transaction for {transaction.supply_item.name} has been completed.")
+        messages.success(request, f"Transaction for {supply_transaction.supply_item.name} has been completed.")
     except Exception as e:
         messages.error(request, f"Error completing transaction: {str(e)}")
     
@@ -592,9 +804,18 @@ def customer_registration(request):
 @login_required
 @user_passes_test(is_customer)
 def customer_requestable_supply(request):
-    supply_items = SupplyItem.objects.filter(status='active').prefetch_related('suppliers')
+    search_query = request.GET.get('q', '').strip()
+    filters = selected_facets(request.GET, CUSTOMER_FACETS)
+    try:
+        page = get_requestable_catalog(search_query, filters, request.GET.get('after'), request.GET.get('before'))
+    except InvalidCursor:
+        raise Http404("Invalid page cursor.")
     return render(request, 'customer/customer_requestable_supply.html', {
-        'supply_items': supply_items
+        'supply_items': page['object_list'],
+        'page_obj': page,
+        'is_paginated': page['has_next'] or page['has_previous'],
+        'facets': get_requestable_facets(search_query, filters),
+        'search_query': search_query,
     })
 
 
@@ -612,17 +833,12 @@ def request_supply_item(request, item_id):
 
             return redirect('supply:customer_requestable_supply')
             
-        if requested_quantity > supply_item.quantity:
+        # Reserve the stock and create the supply request in one transaction
+        try:
+            submit_supply_request(supply_item, request.user.customerprofile, requested_quantity)
+        except InsufficientStock:
             messages.error(request, "Requested quantity exceeds available stock.")
             return redirect('supply:customer_requestable_supply')
-            
-        # Create the supply request
-        SupplyItemRequest.objects.create(
-            supply_item=supply_item,
-            customer=request.user.customerprofile,
-            quantity=requested_quantity,
-
-        )
         
         messages.success(request, "Supply request submitted successfully.")
         return redirect('supply:customer_requestable_supply')
@@ -640,7 +856,7 @@ class CustomerSupplyRequestListView(LoginRequiredMixin, UserPassesTestMixin, Lis
     def get_queryset(self):
         return SupplyItemRequest.objects.filter(
             customer=self.request.user.customerprofile
-        ).order_by('-request_date')
+        ).select_related('supply_item').order_by('-request_date')
 
 class CustomerPendingRequestListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     model = SupplyItemRequest
@@ -653,7 +869,81 @@ class CustomerPendingRequestListView(LoginRequiredMixin, UserPassesTestMixin, Li
     def get_queryset(self):
         return SupplyItemRequest.objects.filter(
             status='PENDING'
-        ).order_by('-request_date')
+        ).select_related('supply_item', 'customer__user').order_by('-request_date')
         
 
-#endregion Customer Views
\ No newline at end of file
+#endregion Customer Views
+
+
+#region Async read views
+# Async counterparts of the read-heavy pages. Queries go through the async
+# ORM, so under ASGI a slow catalog or history query no longer holds a worker
+# thread; under WSGI Django runs them through async_to_sync and they behave
+# like the sync views.
+
+async def arender(request, template_name, context):
+    """Render in a thread: templates and context processors touch the session and user lazily."""
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@login_required
+@user_passes_test(is_customer)
+async def async_customer_requestable_supply(request):
+    search_query = request.GET.get('q', '').strip()
+    filters = selected_facets(request.GET, CUSTOMER_FACETS)
+    try:
+        page = await aget_requestable_catalog(
+            search_query, filters, request.GET.get('after'), request.GET.get('before'),
+        )
+    except InvalidCursor:
+        raise Http404("Invalid page cursor.")
+    return await arender(request, 'customer/customer_requestable_supply.html', {
+        'supply_items': page['object_list'],
+        'page_obj': page,
+        'is_paginated': page['has_next'] or page['has_previous'],
+        'facets': await aget_requestable_facets(search_query, filters),
+        'search_query': search_query,
+    })
+
+
+@login_required
+@user_passes_test(is_customer)
+async def async_customer_supply_requests(request):
+    user = await request.auser()
+    supply_requests = [
+        supply_request async for supply_request in SupplyItemRequest.objects.filter(
+            customer__user=user
+        ).select_related('supply_item').order_by('-request_date')
+    ]
+    return await arender(request, 'customer/customer_supply_request/customer_supply_request.html', {
+        'supply_requests': supply_requests
+    })
+
+
+@login_required
+@user_passes_test(is_supply_manager)
+async def async_customer_pending_requests(request):
+    pending_requests = [
+        supply_request async for supply_request in SupplyItemRequest.objects.filter(
+            status='PENDING'
+        ).select_related('supply_item', 'customer__user').order_by('-request_date')
+    ]
+    return await arender(request, 'supply_manager/customer_related/pending_customer_request.html', {
+        'pending_requests': pending_requests
+    })
+
+
+@login_required
+@user_passes_test(is_supply_manager)
+@permission_required('supply.view_supplyitem', raise_exception=True)
+async def async_supplyitem_detail(request, pk):
+    try:
+        supply_item = await SupplyItem.objects.aget(pk=pk)
+    except SupplyItem.DoesNotExist:
+        raise Http404("No supply item matches the given query.")
+    return await arender(request, 'supply/supplyitem_detail.html', {
+        'supply_item': supply_item
+    })
+
+#endregion Async read views